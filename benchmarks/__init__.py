@@ -0,0 +1,2 @@
+# This file is part of ofxstatement-austrian.
+# See README.rst for more information.
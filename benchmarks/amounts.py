@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+# This file is part of ofxstatement-austrian.
+# See README.rst for more information.
+
+"""Compare the conversion of austrian amounts to Decimal.
+
+The conversions done before parse_austrian_amount (fix_amount_string and the
+parse_value of the base parser, or fix_amount_string and Decimal as in the
+first compiled row functions) are compared to parse_austrian_amount, for
+plain amounts and for ING-DiBa debits, which are negated. This shows what the
+strict check of parse_austrian_amount costs over the unchecked conversion.
+
+    $ python -m benchmarks.amounts -n 1000000
+"""
+
+import argparse
+import random
+import time
+from decimal import Decimal
+from ofxstatement.plugins.base import AustrianCsvParser
+from ofxstatement.plugins.utils import fix_amount_string, \
+    parse_austrian_amount
+from benchmarks.generators import amount
+
+
+def run(func, values):
+    start = time.perf_counter()
+    results = [func(x) for x in values]
+    return time.perf_counter() - start, results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('-n', '--rows', type=int, default=1000000,
+                        help='number of synthetic amounts (default: 1000000)')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    rng = random.Random(args.seed)
+    values = ['{}{}'.format(*amount(rng)) for _ in range(args.rows)]
+    debits = [amount(rng)[1] for _ in range(args.rows)]
+    base = AustrianCsvParser(None)
+
+    cases = [
+        ('amount', values, [
+            ('parse_value', lambda x: base.parse_value(
+                fix_amount_string(x), 'amount')),
+            ('Decimal', lambda x: Decimal(fix_amount_string(x))),
+            ('parse_austrian', parse_austrian_amount),
+        ]),
+        ('debit', debits, [
+            ('parse_value', lambda x: base.parse_value(
+                "-{}".format(fix_amount_string(x)), 'amount')),
+            ('Decimal', lambda x: Decimal(
+                "-{}".format(fix_amount_string(x)))),
+            ('parse_austrian', lambda x: parse_austrian_amount(
+                x).copy_negate()),
+        ]),
+    ]
+
+    print('{:<8} {:<16} {:>10} {:>10}'.format(
+        'values', 'conversion', 'ns/value', 'speedup'))
+    for name, items, conversions in cases:
+        expected = None
+        first = None
+        for label, func in conversions:
+            elapsed, results = run(func, items)
+            if expected is None:
+                expected, first = results, elapsed
+            assert results == expected, "results differ"
+            print('{:<8} {:<16} {:>10.0f} {:>9.2f}x'.format(
+                name, label, elapsed / len(items) * 1e9, first / elapsed))
+
+
+if __name__ == '__main__':
+    main()
+
+# vim: tabstop=4 expandtab shiftwidth=4 softtabstop=4 smartindent autoindent
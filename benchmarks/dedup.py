@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+# This file is part of ofxstatement-austrian.
+# See README.rst for more information.
+
+"""Compare pairwise duplicate and reversal detection to the DedupIndex.
+
+A synthetic Raiffeisen statement is split into two exports which overlap by
+a third of the lines. The first export is imported, then the duplicates in
+the second one and its reversals are found by comparing each line to all
+lines before it, and by the DedupIndex.
+
+    $ python -m benchmarks.dedup -n 5000
+"""
+
+import argparse
+import datetime
+import time
+from ofxstatement.plugins.dedup import DedupIndex, REVERSAL_DAYS
+from benchmarks.transaction_ids import parse
+
+WINDOW = datetime.timedelta(days=REVERSAL_DAYS)
+
+
+def group(line):
+    return (line.date, line.amount, line.memo)
+
+
+def pairwise(first, second):
+    """Find duplicates and reversals the way of the old scripts."""
+    duplicates = 0
+    new = []
+    for i, line in enumerate(second):
+        n = sum(1 for x in second[:i + 1] if group(x) == group(line))
+        if n <= sum(1 for x in first if group(x) == group(line)):
+            duplicates += 1
+        else:
+            new.append(line)
+
+    reversals = []
+    paired = set()
+    for i, line in enumerate(new):
+        if not line.amount:
+            continue
+        for j, other in enumerate(new[:i]):
+            if j not in paired and other.amount == -line.amount and \
+                    abs(line.date - other.date) <= WINDOW:
+                paired.update((i, j))
+                reversals.append((other.id, line.id))
+                break
+    return duplicates, reversals
+
+
+def indexed(first, second):
+    index = DedupIndex()
+    for line in first:
+        index.check('', line)
+    index.commit()
+    for line in second:
+        index.check('', line)
+    return index.duplicates, index.reversals
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('-n', '--rows', type=int, default=5000,
+                        help='transactions per statement (default: 5000)')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    lines = parse('raiffeisen', args.rows, args.seed)
+    third = len(lines) // 3
+    first, second = lines[:2 * third], lines[third:]
+
+    start = time.perf_counter()
+    expected = pairwise(first, second)
+    before = time.perf_counter() - start
+    start = time.perf_counter()
+    result = indexed(first, second)
+    after = time.perf_counter() - start
+    assert result == expected, "results differ"
+
+    print('{:>9} {:>10} {:>10} {:>10} {:>10} {:>9}'.format(
+        'rows', 'duplicates', 'reversals', 'pairwise', 'index', 'speedup'))
+    print('{:>9} {:>10} {:>10} {:>9.3f}s {:>9.3f}s {:>8.1f}x'.format(
+        len(lines), result[0], len(result[1]), before, after,
+        before / after))
+
+
+if __name__ == '__main__':
+    main()
+
+# vim: tabstop=4 expandtab shiftwidth=4 softtabstop=4 smartindent autoindent
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+# This file is part of ofxstatement-austrian.
+# See README.rst for more information.
+
+"""Compare description extraction of Easybank giro exports.
+
+The previous implementation (one regex scan for the check_no, another one to
+split the description, followed by the iban and legacy searches and the
+whitespace cleanup) is compared to the single-pass extract_transaction.
+
+    $ python -m benchmarks.easybank_description -n 1000000
+"""
+
+import argparse
+import itertools
+import time
+from ofxstatement.plugins.easybank import EasybankGiroCsvParser
+from ofxstatement.plugins.utils import clean_multiple_whitespaces
+
+DESCRIPTIONS = [
+    "Einbehaltene KESt                            BG/000000001     ",
+    "Usage, specific reason                       FE/000000003 ABCDEF1G235 "
+    "AT098765432109876543 Payment receiver   ",
+    "Abbuchung Einzugsermächtigung                OG/000000004 Amazon "
+    "*Mktplce EU-AT               01234 01234567890    ",
+    "CustomerNo: XXXXX OrderNr: YYYYYYYY          FE/000000005 "
+    "AT098765432109876543 Payment receiver    ",
+    "Auszahlung Maestro             10.01         MC/000000006 AUTOMAT   "
+    "01234567 K1 27.07.UM 18.57    ",
+]
+
+
+def previous(parser, description):
+    """The extraction as done before the single-pass extractor."""
+    check_no = ''
+    mo = parser.reg_description.search(description)
+    if mo:
+        check_no = str(int(mo.group(0).split('/')[1]))
+
+    parts = [x.strip() for x in parser.reg_description.split(description)]
+    memo = payee = parts[0]
+    if parts[1]:
+        iban_bic = parser.reg_iban.search(parts[1])
+        account_number = None if iban_bic else \
+            parser.reg_legacy.search(parts[1])
+        if iban_bic and iban_bic.group(1):
+            payee = '{0} ({1} {2})'.format(
+                iban_bic.group(3), iban_bic.group(2), iban_bic.group(1))
+        elif iban_bic:
+            payee = '{0} ({1})'.format(iban_bic.group(3), iban_bic.group(2))
+        elif account_number:
+            text = (account_number.group(1) or
+                    account_number.group(4)).strip()
+            payee = '{0} ({1} {2})'.format(
+                text, account_number.group(3), account_number.group(2))
+        else:
+            payee = parts[1]
+
+    return (check_no, clean_multiple_whitespaces(memo),
+            clean_multiple_whitespaces(payee))
+
+
+def run(func, descriptions):
+    start = time.perf_counter()
+    results = [func(x) for x in descriptions]
+    return time.perf_counter() - start, results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('-n', '--rows', type=int, default=1000000,
+                        help='number of synthetic rows (default: 1000000)')
+    args = parser.parse_args(argv)
+
+    giro = EasybankGiroCsvParser(None)
+    descriptions = list(itertools.islice(
+        itertools.cycle(DESCRIPTIONS), args.rows))
+
+    before, expected = run(lambda x: previous(giro, x), descriptions)
+    after, results = run(giro.extract_transaction, descriptions)
+    assert results == expected, "extracted descriptions differ"
+
+    print('{} rows'.format(args.rows))
+    print('previous:      {:8.3f}s {:>10.0f} rows/s'.format(
+        before, args.rows / before))
+    print('single-pass:   {:8.3f}s {:>10.0f} rows/s'.format(
+        after, args.rows / after))
+    print('speedup:       {:8.2f}x'.format(before / after))
+
+
+if __name__ == '__main__':
+    main()
+
+# vim: tabstop=4 expandtab shiftwidth=4 softtabstop=4 smartindent autoindent
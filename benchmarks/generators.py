@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+# This file is part of ofxstatement-austrian.
+# See README.rst for more information.
+
+"""Generate synthetic statements for every supported bank format.
+
+Each generator yields the lines (without line endings) of an export with the
+given number of transactions. The same seed always produces the same file.
+"""
+
+import datetime
+import random
+
+FIRST_DATE = datetime.date(2010, 1, 1)
+
+NAMES = [
+    "Payment receiver", "Some person", "A company GmbH", "Foobar XZY AG",
+    "Stadtwerke Wien", "Hausverwaltung Müller", "Österreichische Post",
+]
+MEMOS = [
+    "Miete", "Strom und Gas", "Invoice 2014/{n}", "Kundennummer {n}",
+    "Gutschrift Überweisung", "Abbuchung Einzugsermächtigung",
+    "/INV/{n} {d}", "Entgelt Kontoauszug", "Zinsen HABEN",
+]
+VENDORS = [
+    "Some vendor/info", "Another vendor", "Amazon *Mktplce EU-AT",
+    "Tankstelle", "Supermarkt Filiale {n}",
+]
+CURRENCIES = ["GBP", "USD", "CHF", "CZK"]
+
+
+def amount(rng, credit_ratio=0.3, scale=1000):
+    """A random amount in the austrian format, e.g. -1.234,56."""
+    cents = rng.randint(1, scale * 100)
+    sign = '+' if rng.random() < credit_ratio else '-'
+    euros = '{:,}'.format(cents // 100).replace(',', '.')
+    return sign, '{},{:02d}'.format(euros, cents % 100)
+
+
+def dates(rng, rows):
+    """Booking dates, newest first, several bookings a day."""
+    day = FIRST_DATE + datetime.timedelta(days=rows // 20 + 1)
+    for _ in range(rows):
+        if rng.random() < 0.05:
+            day -= datetime.timedelta(days=1)
+        yield day
+
+
+def iban(rng):
+    return 'AT{:018d}'.format(rng.randrange(10 ** 18))
+
+
+def bic(rng):
+    return 'ABCDEF{}{}'.format(rng.choice('123456789'), rng.choice('GXY')) + \
+        rng.choice(['', '235', 'XXX'])
+
+
+def text(rng, choices, n):
+    return rng.choice(choices).format(n=n, d='1.10.2015')
+
+
+def easybank_giro(rows, seed=0):
+    rng = random.Random(seed)
+    for n, day in enumerate(dates(rng, rows), 1):
+        memo = text(rng, MEMOS, n)
+        kind = rng.random()
+        if kind < 0.4:
+            info = '{} {} {}'.format(bic(rng), iban(rng), rng.choice(NAMES))
+        elif kind < 0.6:
+            info = '{} {}'.format(iban(rng), rng.choice(NAMES))
+        elif kind < 0.75:
+            info = '{}               {:05d} {:011d}'.format(
+                rng.choice(NAMES), rng.randrange(10 ** 5),
+                rng.randrange(10 ** 11))
+        elif kind < 0.9:
+            info = 'AUTOMAT   {:08d} K1 27.07.UM 18.57'.format(
+                rng.randrange(10 ** 8))
+        else:
+            info = ''
+        description = '{:<45}{}/000{:06d} {}    '.format(
+            memo, rng.choice(['BG', 'FE', 'OG', 'MC', 'VD', 'MB']),
+            n % 1000000, info)
+        sign, value = amount(rng)
+        yield 'AT123456789012345678;{};{:%d.%m.%Y};{:%d.%m.%Y};{}{};EUR' \
+            .format(description, day, day, sign, value)
+
+
+def easybank_creditcard(rows, seed=0):
+    rng = random.Random(seed)
+    for n, day in enumerate(dates(rng, rows), 1):
+        vendor = text(rng, VENDORS, n)
+        if rng.random() < 0.2:
+            foreign = '{} {}'.format(rng.choice(CURRENCIES), amount(rng)[1])
+            description = '{}|{}|{:023d}'.format(vendor, foreign, n)
+        else:
+            description = '{}|{:023d}'.format(vendor, n)
+        sign, value = amount(rng, 0.1)
+        yield '12345678901;{};{:%d.%m.%Y};{:%d.%m.%Y};{}{};EUR'.format(
+            description, day, day, sign, value)
+
+
+def ingdiba(rows, seed=0):
+    rng = random.Random(seed)
+    yield 'Kontonummer;Text;Datum;Währung;Soll;Haben'
+    for n, day in enumerate(dates(rng, rows), 1):
+        sign, value = amount(rng)
+        debit, credit = (value, '0,00') if sign == '-' else ('0,00', value)
+        yield '12345678001;{};{:%d.%m.%Y};EUR;{};{}'.format(
+            text(rng, MEMOS, n), day, debit, credit)
+
+
+def livebank(rows, seed=0):
+    rng = random.Random(seed)
+    yield ('Kontonummer;Auszugsnummer;Buchungsdatum;Valutadatum;Umsatzzeit;'
+           'Zahlungsreferenz;Waehrung;Betrag;Buchungstext;Umsatztext')
+    for n, day in enumerate(dates(rng, rows), 1):
+        sign, value = amount(rng, 0.5)
+        if rng.random() < 0.05:
+            value, details = '0,00', [
+                '"Änderungsmitteilung gemäß Paragraph 29 ZaDiG"',
+                '"Basiszins 0,50 % unverändert."',
+                '"Details siehe www.livebank.at/konditionenblatt"']
+        else:
+            details = [rng.choice(NAMES), '"{}"'.format(text(rng, MEMOS, n)),
+                       '"REF: {:028d}"'.format(n)]
+        yield ('12345678;{};{:%Y-%m-%d};{:%Y-%m-%d};'
+               '{:%Y-%m-%d}-08.21.36.47192;"";EUR;{}{};"{}";{}').format(
+            n // 100 + 1, day, day, day, '-' if sign == '-' else '', value,
+            rng.choice(['Datenträger-Umsatz', 'Internetauftrag']),
+            ';'.join(details))
+
+
+def raiffeisen(rows, seed=0):
+    rng = random.Random(seed)
+    for n, day in enumerate(dates(rng, rows), 1):
+        sign, value = amount(rng)
+        memo = '{}  Empfänger:  {}  Verwendungszweck:  {}'.format(
+            rng.choice(['ELBA-INTERNET', 'Lastschrift', 'Gutschrift']),
+            rng.choice(NAMES), text(rng, MEMOS, n))
+        if rng.random() < 0.1:
+            memo = 'Entgelt Kontoauszug'
+        yield ('{:%d.%m.%Y};"{}";{:%d.%m.%Y};{}{};EUR;'
+               '{:%d.%m.%Y} 00:00:31:010;').format(
+            day, memo, day, '-' if sign == '-' else '', value, day)
+
+
+def oberbank(rows, seed=0):
+    rng = random.Random(seed)
+    yield ('Buchungsdatum;Wertstellung;Betrag;Währung;Auftraggebername;'
+           'Auftraggeber IBAN/Kto.Nr.;Auftraggeber BIC/BLZ;Empfängername;'
+           'Empfänger IBAN/Kto.Nr.;Empfänger BIC/BLZ;Text;Verwendungszweck')
+    for n, day in enumerate(dates(rng, rows), 1):
+        sign, value = amount(rng)
+        name = rng.choice(NAMES)
+        memo = text(rng, MEMOS, n)
+        yield ('{:%d.%m.%Y};{:%d.%m.%Y};{}{};EUR;{};{};{};{};{};{};'
+               '{}, SCOR,   {};{}').format(
+            day, day, '-' if sign == '-' else '', value, name, iban(rng),
+            bic(rng), name, iban(rng), bic(rng), name, memo, memo)
+
+
+# name: (generator, encoding)
+GENERATORS = {
+    'easybank-giro': (easybank_giro, 'cp1252'),
+    'easybank-creditcard': (easybank_creditcard, 'cp1252'),
+    'ing-diba': (ingdiba, 'iso-8859-1'),
+    'livebank': (livebank, 'iso-8859-1'),
+    'raiffeisen': (raiffeisen, 'cp1252'),
+    'oberbank': (oberbank, 'cp1252'),
+}
+
+
+def write(name, filename, rows, seed=0):
+    """Write a synthetic export of the given format to a file."""
+    generator, encoding = GENERATORS[name]
+    with open(filename, 'w', encoding=encoding, newline='') as fout:
+        for line in generator(rows, seed):
+            fout.write(line)
+            fout.write('\r\n')
+
+# vim: tabstop=4 expandtab shiftwidth=4 softtabstop=4 smartindent autoindent
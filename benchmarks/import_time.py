@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+# This file is part of ofxstatement-austrian.
+# See README.rst for more information.
+
+"""Measure the cold start of every plugin up to the first parsed line.
+
+Each measurement runs in a fresh interpreter, which imports the plugin
+module, sets up a parser for a small synthetic export and parses its first
+line. The medians are reported and can be compared against earlier runs:
+
+    $ python -m benchmarks.import_time --save startup.json
+    $ python -m benchmarks.import_time --baseline startup.json
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from benchmarks import generators
+
+# Plugin of each generated format
+FORMATS = {
+    'easybank-giro': ('ofxstatement.plugins.easybank', 'EasybankPlugin'),
+    'easybank-creditcard':
+        ('ofxstatement.plugins.easybank', 'EasybankPlugin'),
+    'ing-diba': ('ofxstatement.plugins.ingdiba', 'IngDiBaPlugin'),
+    'livebank': ('ofxstatement.plugins.livebank', 'LivebankPlugin'),
+    'raiffeisen': ('ofxstatement.plugins.raiffeisen', 'RaiffeisenPlugin'),
+    'oberbank': ('ofxstatement.plugins.oberbank', 'OberbankPlugin'),
+}
+
+CHILD = """
+import importlib, sys, time
+start = time.perf_counter()
+module = importlib.import_module(sys.argv[1])
+imported = time.perf_counter()
+plugin = getattr(module, sys.argv[2])(None, {})
+parser = plugin.get_parser(sys.argv[3])
+with parser.fin:
+    next(parser.iter_lines())
+print(imported - start, time.perf_counter() - start)
+"""
+
+
+def measure(name, filename):
+    """Start a fresh interpreter and get the times in milliseconds."""
+    module, plugin = FORMATS[name]
+    start = time.perf_counter()
+    output = subprocess.check_output(
+        [sys.executable, '-c', CHILD, module, plugin, filename])
+    wall = time.perf_counter() - start
+    imported, first_line = map(float, output.split())
+    return imported * 1000, first_line * 1000, wall * 1000
+
+
+def run(names, repeat):
+    results = []
+    for name in names:
+        fd, filename = tempfile.mkstemp(suffix='.csv')
+        os.close(fd)
+        try:
+            generators.write(name, filename, 10, 0)
+            times = [measure(name, filename) for _ in range(repeat)]
+        finally:
+            os.unlink(filename)
+
+        imported, first_line, wall = zip(*times)
+        results.append({
+            'format': name,
+            'import_ms': statistics.median(imported),
+            'first_line_ms': statistics.median(first_line),
+            'wall_ms': statistics.median(wall),
+        })
+    return results
+
+
+def compare(results, baseline, tolerance):
+    """Get the formats which start slower than the baseline."""
+    previous = {x['format']: x for x in baseline}
+    regressions = []
+    for result in results:
+        if result['format'] not in previous:
+            continue
+        ratio = result['first_line_ms'] / \
+            previous[result['format']]['first_line_ms']
+        result['vs_baseline'] = ratio
+        if ratio > 1 + tolerance:
+            regressions.append(result['format'])
+    return regressions
+
+
+def report(results):
+    print('{:<20} {:>10} {:>14} {:>9} {:>9}'.format(
+        'format', 'import', 'first line', 'wall', 'baseline'))
+    for x in results:
+        ratio = '{:.2f}x'.format(x['vs_baseline']) \
+            if 'vs_baseline' in x else '-'
+        print('{:<20} {:>8.1f}ms {:>12.1f}ms {:>7.1f}ms {:>9}'.format(
+            x['format'], x['import_ms'], x['first_line_ms'], x['wall_ms'],
+            ratio))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('formats', nargs='*', metavar='FORMAT',
+                        help='formats to measure (default: all of {})'
+                             .format(', '.join(FORMATS)))
+    parser.add_argument('-r', '--repeat', type=int, default=5,
+                        help='interpreters started per format (default: 5)')
+    parser.add_argument('--save', metavar='FILE',
+                        help='store the results as JSON')
+    parser.add_argument('--baseline', metavar='FILE',
+                        help='compare the times against stored results')
+    parser.add_argument('--tolerance', type=float, default=0.2,
+                        help='allowed slowdown against the baseline '
+                             '(default: 0.2)')
+    args = parser.parse_args(argv)
+
+    unknown = set(args.formats) - set(FORMATS)
+    if unknown:
+        parser.error('unknown formats: {}'.format(', '.join(sorted(unknown))))
+
+    results = run(args.formats or list(FORMATS), args.repeat)
+
+    regressions = []
+    if args.baseline:
+        with open(args.baseline) as fin:
+            regressions = compare(results, json.load(fin), args.tolerance)
+
+    report(results)
+
+    if args.save:
+        with open(args.save, 'w') as fout:
+            json.dump(results, fout, indent=2)
+
+    if regressions:
+        print('slower than baseline: {}'.format(', '.join(regressions)))
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
+
+# vim: tabstop=4 expandtab shiftwidth=4 softtabstop=4 smartindent autoindent
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+# This file is part of ofxstatement-austrian.
+# See README.rst for more information.
+
+"""Compare the memory used per transaction by parsed statements.
+
+Every format is parsed twice: once building plain StatementLine objects, as
+before, and once building the compact StatementRecord objects.
+
+    $ python -m benchmarks.memory -n 100000
+"""
+
+import argparse
+import gc
+import os
+import tempfile
+import tracemalloc
+from ofxstatement.statement import StatementLine
+from benchmarks import generators
+from benchmarks.run import PARSERS
+
+
+class PlainLine(StatementLine):
+    """A plain StatementLine, which takes all fields as keywords."""
+
+    def __init__(self, id=None, date=None, memo=None, amount=None,
+                 **fields):
+        super(PlainLine, self).__init__(id, date, memo, amount)
+        self.__dict__.update(fields)
+
+
+def retained(parser_class, filename, encoding, record_class):
+    """Parse a file and get the memory retained by the statement."""
+    gc.collect()
+    tracemalloc.start()
+    with open(filename, encoding=encoding) as fin:
+        parser = parser_class(fin)
+        parser.record_class = record_class
+        stmt = parser.parse()
+    del parser
+    gc.collect()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return size, len(stmt.lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('-n', '--rows', type=int, default=100000,
+                        help='transactions per statement (default: 100000)')
+    args = parser.parse_args(argv)
+
+    print('{:<20} {:>9} {:>12} {:>12} {:>8}'.format(
+        'format', 'rows', 'before B/tx', 'after B/tx', 'saved'))
+    for name, parser_class in PARSERS.items():
+        encoding = generators.GENERATORS[name][1]
+        fd, filename = tempfile.mkstemp(suffix='.csv')
+        os.close(fd)
+        try:
+            generators.write(name, filename, args.rows)
+            before, rows = retained(
+                parser_class, filename, encoding, PlainLine)
+            after, rows = retained(
+                parser_class, filename, encoding, parser_class.record_class)
+        finally:
+            os.unlink(filename)
+
+        print('{:<20} {:>9} {:>12.0f} {:>12.0f} {:>7.0%}'.format(
+            name, rows, before / rows, after / rows, 1 - after / before))
+
+
+if __name__ == '__main__':
+    main()
+
+# vim: tabstop=4 expandtab shiftwidth=4 softtabstop=4 smartindent autoindent
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+# This file is part of ofxstatement-austrian.
+# See README.rst for more information.
+
+"""Compare payee rules applied one by one to the compiled PayeeRules.
+
+The payees of a synthetic Easybank giro or Livebank statement are normalized
+with a number of synthetic rules, most of which never match, like a rule file
+grown over the years. Each regex is tried in order until one matches, then
+the same rules are applied by PayeeRules, without and with its cache.
+
+    $ python -m benchmarks.payees -n 100000 --rules 300
+"""
+
+import argparse
+import re
+import time
+from ofxstatement.plugins.payees import PayeeRules
+from benchmarks import generators
+from benchmarks.transaction_ids import parse
+
+FORMATS = ['easybank-giro', 'livebank']
+
+
+def make_rules(count):
+    """Rules for the payees of the generators and many which never match."""
+    rules = [(name, [re.escape(name.split()[0].lower())])
+             for name in generators.NAMES[:4]]
+    rules += [('Payee {}'.format(n), ['^payee {}\\b'.format(n),
+                                      'kundennummer {:06d}'.format(n)])
+              for n in range(count - len(rules))]
+    return rules
+
+
+def one_by_one(rules):
+    compiled = [(name, re.compile(pattern, re.IGNORECASE))
+                for name, patterns in rules for pattern in patterns]
+
+    def normalize(payee):
+        for name, regex in compiled:
+            if regex.search(payee):
+                return name
+        return payee
+    return normalize
+
+
+def run(func, payees):
+    start = time.perf_counter()
+    results = [func(x) for x in payees]
+    return time.perf_counter() - start, results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('-n', '--rows', type=int, default=100000,
+                        help='transactions per statement (default: 100000)')
+    parser.add_argument('--rules', type=int, default=300,
+                        help='number of rules (default: 300)')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    rules = make_rules(args.rules)
+    print('{:<16} {:>9} {:>9} {:>10} {:>10} {:>10} {:>8}'.format(
+        'format', 'rows', 'distinct', 'one by one', 'compiled', 'cached',
+        'speedup'))
+    for name in FORMATS:
+        payees = [x.payee for x in parse(name, args.rows, args.seed)]
+        before, expected = run(one_by_one(rules), payees)
+        compiled = PayeeRules(rules, cache_size=0)
+        uncached, results = run(compiled.normalize, payees)
+        assert results == expected, "payees differ"
+        after, results = run(PayeeRules(rules).normalize, payees)
+        assert results == expected, "payees differ"
+        print('{:<16} {:>9} {:>9} {:>9.3f}s {:>9.3f}s {:>9.3f}s {:>7.2f}x'
+              .format(name, len(payees), len(set(payees)), before, uncached,
+                      after, before / after))
+
+
+if __name__ == '__main__':
+    main()
+
+# vim: tabstop=4 expandtab shiftwidth=4 softtabstop=4 smartindent autoindent
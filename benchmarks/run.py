@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+# This file is part of ofxstatement-austrian.
+# See README.rst for more information.
+
+"""Benchmark all parsers on synthetic statements.
+
+Every format is measured in a fresh process, so the peak RSS is the one of
+that parser alone. Results can be stored and compared against later runs:
+
+    $ python -m benchmarks.run -n 100000 --save baseline.json
+    $ python -m benchmarks.run -n 100000 --baseline baseline.json
+
+Parser options like the memory-mapped reader are switched on with --mmap
+and --memoize-amounts.
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import resource
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from decimal import Decimal
+from ofxstatement.plugins.easybank import \
+    EasybankCreditCardCsvParser, EasybankGiroCsvParser
+from ofxstatement.plugins.ingdiba import IngDiBaCsvParser
+from ofxstatement.plugins.livebank import LivebankCsvParser
+from ofxstatement.plugins.oberbank import OberbankCsvParser
+from ofxstatement.plugins.raiffeisen import RaiffeisenCsvParser
+from benchmarks import generators
+
+PARSERS = {
+    'easybank-giro': EasybankGiroCsvParser,
+    'easybank-creditcard': EasybankCreditCardCsvParser,
+    'ing-diba': IngDiBaCsvParser,
+    'livebank': LivebankCsvParser,
+    'raiffeisen': RaiffeisenCsvParser,
+    'oberbank': OberbankCsvParser,
+}
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return time.perf_counter() - start, result
+
+
+def parse_records(parser, records):
+    lines = []
+    parse_record = parser.row_function()
+    for record in records:
+        parser.cur_record += 1
+        if record:
+            stmtline = parse_record(record)
+            if stmtline:
+                lines.append(stmtline)
+    return lines
+
+
+def update_totals(parser, lines):
+    parser.statement.start_balance = Decimal(0)
+    parser.statement.end_balance = Decimal(0)
+    for stmtline in lines:
+        parser.update_totals(stmtline)
+
+
+def make_parser(parser_class, fin, options):
+    parser = parser_class(fin)
+    for option in options:
+        setattr(parser, option, True)
+    return parser
+
+
+def measure(name, rows, seed, options=()):
+    """Measure a single format, meant to run in a fresh process."""
+    parser_class = PARSERS[name]
+    encoding = generators.GENERATORS[name][1]
+    fd, filename = tempfile.mkstemp(suffix='.csv')
+    os.close(fd)
+    try:
+        generators.write(name, filename, rows, seed)
+
+        with open(filename, encoding=encoding) as fin:
+            total, stmt = timed(make_parser(parser_class, fin, options).parse)
+        peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+        with open(filename, encoding=encoding) as fin:
+            parser = make_parser(parser_class, fin, options)
+            split, records = timed(lambda: list(parser.split_records()))
+        parse, lines = timed(parse_records, parser, records)
+        balance, _ = timed(update_totals, parser, lines)
+    finally:
+        os.unlink(filename)
+
+    return {
+        'format': name,
+        'rows': len(stmt.lines),
+        'rows_per_sec': len(stmt.lines) / total,
+        'peak_rss_kib': peak_rss,
+        'total': total,
+        'split_records': split,
+        'parse_record': parse,
+        'balance': balance,
+    }
+
+
+def run(names, rows, seed, options=()):
+    context = multiprocessing.get_context('spawn')
+    results = []
+    for name in names:
+        with ProcessPoolExecutor(1, mp_context=context) as executor:
+            results.append(executor.submit(
+                measure, name, rows, seed, options).result())
+    return results
+
+
+def compare(results, baseline, tolerance):
+    """Get the formats which became slower than the baseline."""
+    previous = {x['format']: x for x in baseline}
+    regressions = []
+    for result in results:
+        if result['format'] not in previous:
+            continue
+        ratio = result['rows_per_sec'] / \
+            previous[result['format']]['rows_per_sec']
+        result['vs_baseline'] = ratio
+        if ratio < 1 - tolerance:
+            regressions.append(result['format'])
+    return regressions
+
+
+def report(results):
+    print('{:<20} {:>9} {:>11} {:>10} {:>8} {:>8} {:>8} {:>9}'.format(
+        'format', 'rows', 'rows/s', 'rss KiB', 'split', 'parse', 'balance',
+        'baseline'))
+    for x in results:
+        ratio = '{:.2f}x'.format(x['vs_baseline']) \
+            if 'vs_baseline' in x else '-'
+        print('{:<20} {:>9} {:>11.0f} {:>10} {:>7.3f}s {:>7.3f}s {:>7.3f}s '
+              '{:>9}'.format(x['format'], x['rows'], x['rows_per_sec'],
+                             x['peak_rss_kib'], x['split_records'],
+                             x['parse_record'], x['balance'], ratio))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('formats', nargs='*', metavar='FORMAT',
+                        help='formats to benchmark (default: all of {})'
+                             .format(', '.join(PARSERS)))
+    parser.add_argument('-n', '--rows', type=int, default=100000,
+                        help='transactions per statement (default: 100000)')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--mmap', action='store_true',
+                        help='use the memory-mapped reader')
+    parser.add_argument('--memoize-amounts', action='store_true',
+                        help='convert each distinct amount string once')
+    parser.add_argument('--save', metavar='FILE',
+                        help='store the results as JSON')
+    parser.add_argument('--baseline', metavar='FILE',
+                        help='compare rows/s against stored results')
+    parser.add_argument('--tolerance', type=float, default=0.1,
+                        help='allowed slowdown against the baseline '
+                             '(default: 0.1)')
+    args = parser.parse_args(argv)
+
+    unknown = set(args.formats) - set(PARSERS)
+    if unknown:
+        parser.error('unknown formats: {}'.format(', '.join(sorted(unknown))))
+
+    options = [x for x in ('mmap', 'memoize_amounts') if getattr(args, x)]
+    results = run(args.formats or list(PARSERS), args.rows, args.seed,
+                  options)
+
+    regressions = []
+    if args.baseline:
+        with open(args.baseline) as fin:
+            regressions = compare(results, json.load(fin), args.tolerance)
+
+    report(results)
+
+    if args.save:
+        with open(args.save, 'w') as fout:
+            json.dump(results, fout, indent=2)
+
+    if regressions:
+        print('slower than baseline: {}'.format(', '.join(regressions)))
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
+
+# vim: tabstop=4 expandtab shiftwidth=4 softtabstop=4 smartindent autoindent
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+# This file is part of ofxstatement-austrian.
+# See README.rst for more information.
+
+"""Compare queries on lists of statement lines to the StatementStore.
+
+A synthetic statement is parsed, then filtered by date range, sign and memo
+and summed by month and transaction type, once by scanning its lines and
+once with a store built from them. The memory of the lines and the store is
+measured with tracemalloc.
+
+    $ python -m benchmarks.store -n 100000
+"""
+
+import argparse
+import collections
+import datetime
+import time
+import tracemalloc
+from ofxstatement.plugins.store import StatementStore
+from benchmarks.transaction_ids import parse
+
+# The queries, as arguments of StatementStore.select
+QUERIES = [
+    ('one month', dict(start=datetime.date(2011, 3, 1),
+                       end=datetime.date(2011, 3, 31))),
+    ('debits', dict(sign=-1)),
+    ('memo', dict(memo='miete')),
+    ('month+memo', dict(start=datetime.date(2011, 3, 1),
+                        end=datetime.date(2011, 3, 31), memo='entgelt')),
+]
+
+
+def scan(lines, start=None, end=None, sign=None, memo=None):
+    """Filter lines the way of the old scripts."""
+    start = start and datetime.datetime.combine(start, datetime.time())
+    end = end and datetime.datetime.combine(end, datetime.time())
+    result = []
+    for line in lines:
+        if start is not None and line.date < start:
+            continue
+        if end is not None and line.date > end:
+            continue
+        if sign is not None and (line.amount < 0) != (sign < 0):
+            continue
+        if memo is not None and memo not in (line.memo or '').lower():
+            continue
+        result.append(line)
+    return sorted(result, key=lambda x: x.date)
+
+
+def monthly_totals(lines):
+    totals = collections.defaultdict(collections.Counter)
+    for line in lines:
+        totals[line.date.year, line.date.month][line.trntype] += line.amount
+    return totals
+
+
+def build_store(lines):
+    store = StatementStore()
+    store.extend(lines)
+    store.index()
+    return store
+
+
+def timed(func, *args, **kwargs):
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    return time.perf_counter() - start, result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('-n', '--rows', type=int, default=100000,
+                        help='transactions per statement (default: 100000)')
+    parser.add_argument('--format', default='raiffeisen')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    tracemalloc.start()
+    lines = parse(args.format, args.rows, args.seed)
+    lines_memory = tracemalloc.get_traced_memory()[0]
+    store = build_store(lines)
+    store_memory = tracemalloc.get_traced_memory()[0] - lines_memory
+    tracemalloc.stop()
+    build, store = timed(build_store, lines)
+
+    print('{} lines: {:.1f} MiB, store: {:.1f} MiB, built in {:.3f}s'.format(
+        len(lines), lines_memory / 2 ** 20, store_memory / 2 ** 20, build))
+    print('{:<12} {:>8} {:>10} {:>10} {:>8}'.format(
+        'query', 'rows', 'scan', 'store', 'speedup'))
+    for label, query in QUERIES:
+        before, expected = timed(scan, lines, **query)
+        after, rows = timed(store.select, **query)
+        assert [x.id for x in expected] == [store.ids[x] for x in rows], \
+            "rows differ"
+        print('{:<12} {:>8} {:>9.4f}s {:>9.4f}s {:>7.1f}x'.format(
+            label, len(rows), before, after, before / after))
+
+    before, expected = timed(monthly_totals, lines)
+    after, totals = timed(store.monthly_totals)
+    assert {k: dict(v) for k, v in expected.items()} == \
+        {k: dict(v) for k, v in totals.items()}, "totals differ"
+    print('{:<12} {:>8} {:>9.4f}s {:>9.4f}s {:>7.1f}x'.format(
+        'monthly', len(totals), before, after, before / after))
+
+
+if __name__ == '__main__':
+    main()
+
+# vim: tabstop=4 expandtab shiftwidth=4 softtabstop=4 smartindent autoindent
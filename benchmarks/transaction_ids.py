@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+# This file is part of ofxstatement-austrian.
+# See README.rst for more information.
+
+"""Compare generate_transaction_id to the IdEngine.
+
+Synthetic statements of every format which generates ids are parsed, then
+the ids of all lines are generated by both and compared.
+
+    $ python -m benchmarks.transaction_ids -n 100000
+"""
+
+import argparse
+import os
+import tempfile
+import time
+from ofxstatement.statement import generate_transaction_id
+from ofxstatement.plugins.ids import IdEngine
+from benchmarks import generators
+from benchmarks.run import PARSERS
+
+# Formats whose parsers generate the ids
+FORMATS = ['easybank-giro', 'ing-diba', 'livebank', 'raiffeisen', 'oberbank']
+
+
+def parse(name, rows, seed):
+    fd, filename = tempfile.mkstemp(suffix='.csv')
+    os.close(fd)
+    try:
+        generators.write(name, filename, rows, seed)
+        with open(filename, encoding=generators.GENERATORS[name][1]) as fin:
+            return PARSERS[name](fin).parse().lines
+    finally:
+        os.unlink(filename)
+
+
+def run(func, lines):
+    start = time.perf_counter()
+    results = [func(x) for x in lines]
+    return time.perf_counter() - start, results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('-n', '--rows', type=int, default=100000,
+                        help='transactions per statement (default: 100000)')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    print('{:<16} {:>9} {:>10} {:>10} {:>8}'.format(
+        'format', 'rows', 'previous', 'engine', 'speedup'))
+    for name in FORMATS:
+        lines = parse(name, args.rows, args.seed)
+        before, expected = run(generate_transaction_id, lines)
+        after, results = run(IdEngine().generate, lines)
+        assert results == expected, "ids differ"
+        print('{:<16} {:>9} {:>9.3f}s {:>9.3f}s {:>7.2f}x'.format(
+            name, len(lines), before, after, before / after))
+
+
+if __name__ == '__main__':
+    main()
+
+# vim: tabstop=4 expandtab shiftwidth=4 softtabstop=4 smartindent autoindent
@@ -44,10 +44,20 @@ setup(name="ofxstatement-austrian",
               "ing-diba = ofxstatement.plugins.ingdiba:IngDiBaPlugin",
               "livebank = ofxstatement.plugins.livebank:LivebankPlugin",
               "raiffeisen = ofxstatement.plugins.raiffeisen:RaiffeisenPlugin",
-              "oberbank = ofxstatement.plugins.oberbank:OberbankPlugin"
+              "oberbank = ofxstatement.plugins.oberbank:OberbankPlugin",
+              "austrian-auto = ofxstatement.plugins.auto:AutoPlugin"
+          ],
+          "console_scripts":
+          [
+              "ofxstatement-austrian-batch = ofxstatement.plugins.batch:main",
+              "ofxstatement-austrian-service = "
+              "ofxstatement.plugins.service:main",
           ]
       },
       install_requires=["ofxstatement"],
+      extras_require={
+          "parquet": ["pyarrow"],
+      },
       test_suite="ofxstatement.plugins.tests",
       include_package_data=True,
       zip_safe=True
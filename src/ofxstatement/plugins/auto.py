@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+# This file is part of ofxstatement-austrian.
+# See README.rst for more information.
+
+import collections
+from ofxstatement.plugins.base import AustrianPlugin, read_sample
+from ofxstatement.plugins.easybank import EasybankPlugin
+from ofxstatement.plugins.ingdiba import IngDiBaPlugin
+from ofxstatement.plugins.livebank import LivebankPlugin
+from ofxstatement.plugins.oberbank import OberbankPlugin
+from ofxstatement.plugins.raiffeisen import RaiffeisenPlugin
+
+# Same names as the entry points in setup.py
+PLUGINS = collections.OrderedDict([
+    ('easybank', EasybankPlugin),
+    ('ing-diba', IngDiBaPlugin),
+    ('livebank', LivebankPlugin),
+    ('raiffeisen', RaiffeisenPlugin),
+    ('oberbank', OberbankPlugin),
+])
+
+
+def detect(filename):
+    """Get the name of the plugin that matches a file best."""
+    with open(filename, 'rb') as fin:
+        records = read_sample(fin)
+
+    scores = [(plugin.score(records), name)
+              for name, plugin in PLUGINS.items()]
+    score, name = max(scores, key=lambda x: x[0])
+    if score <= 0:
+        raise ValueError('Cannot detect the bank of {}'.format(filename))
+    return name
+
+
+class AutoPlugin(AustrianPlugin):
+    """Austrian banks, detected automatically (CSV)"""
+
+    def get_parser(self, filename):
+        """Get a parser instance of the detected bank."""
+        plugin = PLUGINS[detect(filename)](self.ui, self.settings)
+        return plugin.get_parser(filename)
+
+# vim: tabstop=4 expandtab shiftwidth=4 softtabstop=4 smartindent autoindent
@@ -0,0 +1,445 @@
+#!/usr/bin/env python3
+# This file is part of ofxstatement-austrian.
+# See README.rst for more information.
+
+import collections
+import csv
+import time
+from decimal import Decimal
+from ofxstatement.parser import CsvStatementParser
+from ofxstatement.plugin import Plugin
+from ofxstatement.statement import Statement, StatementLine
+from ofxstatement.plugins.ids import IdEngine
+from ofxstatement.plugins.utils import parse_date
+
+# The modules for the optional modes (mmap, parallel, seen index, dedup
+# index, payee rules, cache, profile) are imported when a mode is used, to
+# keep the startup of plugins fast.
+
+# Number of bytes read from the start of a file to detect its format
+SAMPLE_SIZE = 4096
+
+
+def read_sample(fp, size=SAMPLE_SIZE):
+    """Split the start of a file into non-empty records.
+
+    The file may be opened in text or binary mode, bytes are decoded as
+    latin-1. The position of the file is reset afterwards.
+    """
+    data = fp.read(size)
+    fp.seek(0)
+    if isinstance(data, bytes):
+        data = data.decode('latin-1')
+
+    lines = data.splitlines()
+    if len(data) == size:
+        # The last line may be cut off
+        lines = lines[:-1]
+    return [x for x in csv.reader(lines, delimiter=";") if x]
+
+
+class StatementRecord(StatementLine):
+    """A compact statement line.
+
+    All fields set by the parsers are stored in slots, so no per-instance
+    dict is allocated unless other attributes are assigned.
+    """
+
+    __slots__ = ('id', 'date', 'memo', 'amount', 'payee', 'date_user',
+                 'check_no', 'refnum', 'trntype')
+
+    def __init__(self, id=None, date=None, memo=None, amount=None,
+                 payee=None, date_user=None, check_no=None, refnum=None,
+                 trntype="CHECK"):
+        # Same order as __slots__
+        self.id = id
+        self.date = date
+        self.memo = memo
+        self.amount = amount
+        self.payee = payee
+        self.date_user = date_user
+        self.check_no = check_no
+        self.refnum = refnum
+        self.trntype = trntype
+
+    def __repr__(self):
+        return "<{}> {}".format(type(self).__name__, {
+            x: getattr(self, x) for x in self.__slots__})
+
+
+class AustrianCsvParser(CsvStatementParser):
+    """The csv parser base for all austrian banks."""
+
+    date_format = "%d.%m.%Y"
+
+    # Class of the statement lines built by parse_record, called with the
+    # fields of StatementRecord as keywords
+    record_class = StatementRecord
+
+    # The layout of the exports (see FormatSpec), whose row function parses
+    # the split records
+    spec = None
+
+    # Keep the amounts converted from each distinct string, so strings which
+    # recur are converted only once (up to table_size strings)
+    memoize_amounts = False
+    table_size = 65536
+
+    # Split the file with a memory map instead of csv.reader
+    mmap = False
+
+    # Skip transactions which are already in this index (see SeenIndex)
+    seen_index = None
+
+    # Skip transactions imported before and pair reversals (see DedupIndex)
+    dedup = None
+
+    # Replace the payees of the lines (see PayeeRules)
+    payees = None
+
+    # Parse the file in chunks with this many processes (see parallel.py).
+    # The plugin is needed to set up a parser for each chunk.
+    workers = 1
+    plugin = None
+
+    # Return the statement from this cache if the file was parsed before
+    # (see ParseCache)
+    cache = None
+    cache_key = None
+
+    # Collect timings and counters while parsing (see Profile)
+    profile = None
+
+    # Parse into one statement per account and currency (see
+    # parse_statements)
+    split_accounts = False
+
+    def __init__(self, fin):
+        super(AustrianCsvParser, self).__init__(fin)
+        self.amount_table = {}
+        self.ids = IdEngine()
+        self.statements = collections.OrderedDict()
+        # The reversals paired by the dedup index in the last parse
+        self.reversals = []
+
+    def split_records(self):
+        """Split records using a custom dialect."""
+        if self.mmap:
+            from ofxstatement.plugins.reader import mmap_records
+            return mmap_records(self.fin)
+        return csv.reader(self.fin, delimiter=";")
+
+    def parse_value(self, value, field):
+        """Parse a value, with the date format of the parser for dates."""
+        if field == 'date':
+            return parse_date(value, self.date_format)
+        return super(AustrianCsvParser, self).parse_value(value, field)
+
+    def row_function(self):
+        """Get the compiled row function of the spec for this parser."""
+        return self.spec.compile(self.memoize_amounts,
+                                 self.split_accounts)(self)
+
+    def parse_record(self, line):
+        """Parse a record with the row function of the spec.
+
+        The row function is built for each call, parse_records builds it
+        once for all records.
+        """
+        return self.row_function()(line)
+
+    def parse(self):
+        """Parse all lines into the statement."""
+        if self.cache is not None:
+            stmt = self.cache.get(self.get_cache_key())
+            if stmt is not None:
+                self.count('cache_hits')
+                if self.profile is not None:
+                    self.profile.save()
+                self.statement = stmt
+                return stmt
+
+        self.statement.lines.extend(self.iter_lines())
+        if self.cache is not None:
+            self.cache.put(self.cache_key, self.statement)
+        return self.statement
+
+    def get_cache_key(self):
+        """Get the key of the file in the cache, hashed on first use."""
+        if self.cache_key is None:
+            settings = self.plugin.settings
+            if self.payees is not None:
+                # The rules may change while the name of the file does not
+                settings = dict(settings, payees=self.payees.digest)
+            self.cache_key = self.cache.key(
+                self.fin.name, type(self.plugin).__name__, settings)
+        return self.cache_key
+
+    def parse_statements(self):
+        """Parse the lines into one statement per account and currency.
+
+        Combined exports of several accounts are split in a single pass,
+        each statement gets its own balance and date range. The statements
+        are returned in the order their accounts first appear, and are not
+        cached. Parsers whose spec has no account column return the
+        statement of parse.
+        """
+        if self.spec is None or self.spec.account is None:
+            return [self.parse()]
+
+        for stmt, stmtline in self.iter_statement_lines():
+            stmt.lines.append(stmtline)
+        return list(self.statements.values()) or [self.statement]
+
+    def iter_statement_lines(self):
+        """Yield each statement line with the statement of its account.
+
+        Like iter_lines, but the accounts are split as in parse_statements.
+        The lines are not collected in the statements.
+        """
+        if self.spec is None or self.spec.account is None:
+            for stmtline in self.iter_lines():
+                yield self.statement, stmtline
+            return
+
+        template = self.statement
+        self.split_accounts = True
+        self.statements.clear()
+        try:
+            for stmtline in self.iter_lines():
+                yield self.statement, stmtline
+        finally:
+            self.split_accounts = False
+            self.statement = template
+
+    def add_statement(self, account_id, currency):
+        """Add the statement of an account and currency while splitting."""
+        stmt = Statement(self.statement.bank_id, account_id, currency,
+                         self.statement.account_type)
+        stmt.start_balance = stmt.end_balance = Decimal(0)
+        self.statements[account_id, currency] = stmt
+        return stmt
+
+    def iter_lines(self):
+        """Parse and yield statement lines one at a time.
+
+        The lines are not collected in the statement. Instead, the end
+        balance as well as the start and end date of the statement are
+        updated with each line, so the statement is complete as soon as the
+        generator is exhausted.
+
+        With a seen index, transactions imported before are skipped and the
+        new ones are committed to the index once all lines are parsed. With
+        more than one worker, the file is parsed in chunks (see parallel.py),
+        unless the accounts are split.
+        Identical transactions are numbered before they are looked up in the
+        seen index, if the id engine counts collisions (see IdEngine).
+        With a dedup index, re-imported transactions are skipped and the
+        reversals are paired into reversals (see DedupIndex), before the
+        seen index.
+        Payees are normalized with the payee rules, if any.
+        """
+        profile = self.profile
+        start = time.perf_counter()
+
+        stmt = self.statement
+        stmt.start_balance = stmt.start_balance or Decimal(0)
+        stmt.end_balance = stmt.start_balance
+
+        if self.workers > 1 and self.plugin is not None and \
+                not self.split_accounts:
+            from ofxstatement.plugins.parallel import parse_chunks
+            stmtlines = parse_chunks(self)
+        else:
+            stmtlines = self.parse_records()
+
+        payees = self.payees
+        for stmtline in stmtlines:
+            if payees is not None:
+                stmtline.payee = payees.normalize(stmtline.payee)
+
+            if self.ids.count_collisions:
+                stmtline.id = self.ids.disambiguate(stmtline.id, (
+                    self.statement.account_id, self.statement.currency))
+
+            if self.dedup is not None:
+                if self.dedup.check(self.statement.account_id, stmtline):
+                    self.count('rows_duplicate')
+                    continue
+
+            if self.seen_index is not None:
+                account_id = self.statement.account_id
+                if self.seen_index.seen(account_id, stmtline.id):
+                    self.count('rows_seen')
+                    continue
+                self.seen_index.add(account_id, stmtline.id)
+
+            stmtline.assert_valid()
+            if profile is None:
+                self.update_totals(stmtline)
+            else:
+                profile.count('lines')
+                with profile.stage('update_totals'):
+                    self.update_totals(stmtline)
+            yield stmtline
+
+        if self.ids.count_collisions:
+            self.count('id_collisions', self.ids.collisions)
+        if self.dedup is not None:
+            self.reversals = self.dedup.reversals
+            self.count('reversals', len(self.reversals))
+            self.dedup.commit()
+        if self.seen_index is not None:
+            self.seen_index.commit()
+
+        if profile is not None:
+            if payees is not None:
+                for name, hits in payees.report():
+                    profile.count('payee_rule:{}'.format(name), hits)
+            profile.timings['total'] += time.perf_counter() - start
+            profile.save()
+
+    def parse_records(self):
+        """Parse the split records and yield the statement lines."""
+        profile = self.profile
+        records = self.split_records()
+        if profile is not None:
+            records = profile.timed(records, 'split_records')
+
+        parse_record = self.row_function()
+
+        for line in records:
+            self.cur_record += 1
+            if not line:
+                self.count('rows_empty')
+                continue
+
+            if profile is None:
+                stmtline = parse_record(line)
+            else:
+                profile.count('rows_read')
+                with profile.stage('parse_record'):
+                    stmtline = parse_record(line)
+
+            if stmtline:
+                yield stmtline
+            else:
+                self.count('rows_skipped')
+
+    def count(self, name, n=1):
+        """Increment a profiling counter, if profiling."""
+        if self.profile is not None:
+            self.profile.count(name, n)
+
+    def transaction_id(self, stmtline):
+        """Generate the id of a statement line (see IdEngine)."""
+        if self.profile is None:
+            return self.ids.generate(stmtline)
+        with self.profile.stage('transaction_id'):
+            return self.ids.generate(stmtline)
+
+    def update_totals(self, stmtline):
+        """Update balance and date range of the statement with a line.
+
+        This replaces recalculate_balance, which needs a second pass over
+        all lines once they are parsed.
+        """
+        stmt = self.statement
+        if stmtline.amount is not None:
+            stmt.end_balance += stmtline.amount
+
+        if stmtline.date is not None:
+            if stmt.start_date is None or stmtline.date < stmt.start_date:
+                stmt.start_date = stmtline.date
+            if stmt.end_date is None or stmtline.date > stmt.end_date:
+                stmt.end_date = stmtline.date
+
+
+class AustrianPlugin(Plugin):
+    """The plugin base for all austrian banks."""
+
+    # Signature of the exports, used to detect the bank of a file
+    parser_class = None
+    header = None
+    columns = None
+
+    @classmethod
+    def score(cls, records):
+        """Score how well the first records of a file match this bank."""
+        score = 0
+        if cls.header and records and \
+                ";".join(records[0]).startswith(cls.header):
+            score += 10
+            records = records[1:]
+
+        records = records[:10]
+        if not records:
+            return score
+
+        if cls.columns and all(len(x) == cls.columns for x in records):
+            score += 2
+
+        spec = cls.parser_class and cls.parser_class.spec
+        if spec and spec.date_column is not None:
+            col = spec.date_column
+            try:
+                for record in records:
+                    parse_date(record[col], spec.date_format)
+                score += 2
+            except (IndexError, ValueError):
+                pass
+
+        return score
+
+    def enabled(self, name):
+        """Check if a boolean setting is switched on."""
+        value = str(self.settings.get(name, ''))
+        return value.lower() in ('1', 'yes', 'true', 'on')
+
+    def open_file(self, filename):
+        """Open an export in the charset setting or the one of the bank."""
+        encoding = self.settings.get('charset',
+                                     self.parser_class.spec.encoding)
+        return open(filename, 'r', encoding=encoding)
+
+    def setup_parser(self, parser):
+        """Apply the settings common to all banks to a parser."""
+        parser.memoize_amounts = self.enabled('memoize_amounts')
+        parser.mmap = self.enabled('mmap')
+        parser.workers = int(self.settings.get('workers', 1))
+        parser.plugin = self
+        parser.ids.count_collisions = self.enabled('count_collisions')
+        if self.settings.get('profile'):
+            from ofxstatement.plugins.profiling import Profile
+            parser.profile = Profile(self.settings['profile'])
+        if self.settings.get('dedup'):
+            from ofxstatement.plugins.dedup import DedupIndex, REVERSAL_DAYS
+            parser.dedup = DedupIndex(
+                self.settings['dedup'],
+                int(self.settings.get('reversal_days', REVERSAL_DAYS)))
+        if self.settings.get('payees'):
+            from ofxstatement.plugins.payees import PayeeRules
+            parser.payees = PayeeRules.load(self.settings['payees'])
+        if self.settings.get('seen_index'):
+            from ofxstatement.plugins.seen import SeenIndex
+            parser.seen_index = SeenIndex(self.settings['seen_index'])
+        elif self.settings.get('cache') and parser.dedup is None:
+            # Not with a seen or dedup index, the result depends on earlier
+            # imports
+            from ofxstatement.plugins.cache import ParseCache
+            parser.cache = ParseCache(
+                self.settings['cache'],
+                int(self.settings.get('cache_size', 0)) << 20)
+        return parser
+
+    def iter_lines(self, filename):
+        """Yield the statement lines of a file one at a time.
+
+        The file is closed once all lines are consumed.
+        """
+        parser = self.get_parser(filename)
+        with parser.fin:
+            for stmtline in parser.iter_lines():
+                yield stmtline
+
+# vim: tabstop=4 expandtab shiftwidth=4 softtabstop=4 smartindent autoindent
@@ -0,0 +1,244 @@
+#!/usr/bin/env python3
+# This file is part of ofxstatement-austrian.
+# See README.rst for more information.
+
+import argparse
+import collections
+import contextlib
+import fnmatch
+import os
+import re
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from ofxstatement.ofx import OfxWriter
+from ofxstatement.ui import UI
+from ofxstatement.plugins import writers
+from ofxstatement.plugins.auto import PLUGINS, detect
+
+# Detect the bank of each file
+AUTO = 'auto'
+
+# Write OFX files, the other formats are written by the writers module
+OFX = 'ofx'
+OUTPUT_FORMATS = [OFX] + sorted(writers.FORMATS)
+
+# output names the written files for display, outputs lists them
+BatchResult = collections.namedtuple(
+    'BatchResult', 'filename plugin output rows seconds error outputs')
+
+
+def collect_files(paths, pattern='*.csv'):
+    """Expand directories to the (sorted) files they contain.
+
+    Only the files of a directory which match pattern are taken, so the
+    outputs of an earlier run are not converted again. Files given by name
+    are always taken.
+    """
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            files.extend(sorted(
+                os.path.join(path, name) for name in os.listdir(path)
+                if fnmatch.fnmatch(name, pattern) and
+                os.path.isfile(os.path.join(path, name))))
+        else:
+            files.append(path)
+    return files
+
+
+def output_filename(filename, output_dir=None, output_format=OFX):
+    """Get the name of the OFX (or other output) file for an input file."""
+    if output_format == OFX:
+        extension = '.ofx'
+    else:
+        extension = writers.FORMATS[output_format].extension
+    name = os.path.splitext(filename)[0] + extension
+    if output_dir:
+        name = os.path.join(output_dir, os.path.basename(name))
+    return name
+
+
+def account_filenames(output, statements):
+    """Get the names of the OFX files of the statements of several accounts.
+
+    The account id is appended to the name, and the currency if an account
+    has statements in several currencies.
+    """
+    stem, ext = os.path.splitext(output)
+    accounts = collections.Counter(x.account_id for x in statements)
+    names = []
+    for stmt in statements:
+        suffix = str(stmt.account_id)
+        if accounts[stmt.account_id] > 1:
+            suffix += '-{}'.format(stmt.currency)
+        names.append('{}-{}{}'.format(
+            stem, re.sub(r'[^\w.-]', '_', suffix), ext))
+    return names
+
+
+@contextlib.contextmanager
+def open_atomic(filename, binary=False):
+    """Open a temporary file which replaces filename once it is closed.
+
+    Readers never see a partial file. If writing fails, the temporary file
+    is removed and filename is left alone.
+    """
+    fd, tmpname = tempfile.mkstemp(
+        prefix='.', suffix='.tmp', dir=os.path.dirname(filename) or '.')
+    try:
+        if binary:
+            fout = os.fdopen(fd, 'wb')
+        else:
+            fout = os.fdopen(fd, 'w', encoding='utf-8', newline='')
+        with fout:
+            yield fout
+        os.replace(tmpname, filename)
+    except BaseException:
+        os.unlink(tmpname)
+        raise
+
+
+def write_atomic(filename, data):
+    """Write a text file at once, so readers never see a partial file."""
+    with open_atomic(filename) as fout:
+        fout.write(data)
+
+
+def convert_file(filename, plugin_name, settings=None, output_dir=None,
+                 output_format=OFX):
+    """Convert a single file to OFX (or another format).
+
+    Returns a BatchResult. The lines are streamed to the other formats,
+    with the accounts of combined exports in a column.
+    """
+    start = time.perf_counter()
+    output = output_filename(filename, output_dir, output_format)
+    try:
+        if os.path.abspath(output) == os.path.abspath(filename):
+            raise ValueError("The output would replace the input file, use "
+                             "another output directory")
+        if plugin_name == AUTO:
+            plugin_name = detect(filename)
+        plugin = PLUGINS[plugin_name](UI(), dict(settings or {}))
+        parser = plugin.get_parser(filename)
+        if output_format != OFX:
+            with parser.fin, open_atomic(
+                    output, writers.FORMATS[output_format].binary) as fout:
+                rows = writers.write(parser, fout, output_format)
+            return BatchResult(filename, plugin_name, output, rows,
+                               time.perf_counter() - start, None, [output])
+
+        with parser.fin:
+            if plugin.enabled('split_accounts'):
+                statements = parser.parse_statements()
+            else:
+                statements = [parser.parse()]
+
+        if len(statements) == 1:
+            outputs = [output]
+        else:
+            outputs = account_filenames(output, statements)
+        for name, stmt in zip(outputs, statements):
+            write_atomic(name, OfxWriter(stmt).toxml())
+    except Exception as e:
+        return BatchResult(filename, plugin_name, None, 0,
+                           time.perf_counter() - start,
+                           '{}: {}'.format(type(e).__name__, e), [])
+    return BatchResult(filename, plugin_name, ', '.join(outputs),
+                       sum(len(x.lines) for x in statements),
+                       time.perf_counter() - start, None, outputs)
+
+
+def convert_files(jobs, settings=None, output_dir=None, workers=None,
+                  output_format=OFX):
+    """Convert (filename, plugin name) pairs in a process pool.
+
+    The results are returned in the order of the jobs. With a single worker,
+    the files are converted in the current process.
+    """
+    jobs = list(jobs)
+    filenames = [filename for filename, _ in jobs]
+    plugin_names = [plugin_name for _, plugin_name in jobs]
+    n = len(jobs)
+    args = (filenames, plugin_names, [settings] * n, [output_dir] * n,
+            [output_format] * n)
+    if workers == 1:
+        return list(map(convert_file, *args))
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(convert_file, *args))
+
+
+def format_summary(results):
+    """Format a summary of per-file timings and row counts."""
+    lines = []
+    for result in results:
+        status = result.error or 'ok'
+        lines.append('{:>8} rows {:>9.3f}s  {}  ({}) {}'.format(
+            result.rows, result.seconds, result.filename, result.plugin,
+            status))
+
+    rows = sum(result.rows for result in results)
+    failed = sum(1 for result in results if result.error)
+    lines.append('{} files, {} rows, {} failed'.format(
+        len(results), rows, failed))
+    return '\n'.join(lines)
+
+
+def parse_settings(values):
+    """Parse KEY=VALUE pairs into a settings dict."""
+    settings = {}
+    for value in values:
+        key, sep, setting = value.partition('=')
+        if not sep:
+            raise argparse.ArgumentTypeError(
+                'Invalid setting "{}", expected KEY=VALUE'.format(value))
+        settings[key.strip()] = setting.strip()
+    return settings
+
+
+def main(argv=None):
+    """Convert many bank exports to OFX in parallel."""
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument('paths', nargs='+', metavar='PATH',
+                        help='input files or directories')
+    parser.add_argument('-t', '--type', default=AUTO,
+                        choices=[AUTO] + list(PLUGINS),
+                        help='plugin to use for all input files '
+                             '(default: detect the bank of each file)')
+    parser.add_argument('-o', '--output-dir',
+                        help='directory for the OFX files '
+                             '(default: next to the input file)')
+    parser.add_argument('-f', '--format', default=OFX,
+                        choices=OUTPUT_FORMATS,
+                        help='output format (default: ofx)')
+    parser.add_argument('-j', '--workers', type=int, default=None,
+                        help='number of worker processes '
+                             '(default: number of CPUs)')
+    parser.add_argument('-p', '--pattern', default='*.csv',
+                        help='pattern of the files to convert in directories '
+                             '(default: *.csv)')
+    parser.add_argument('-s', '--setting', action='append', default=[],
+                        metavar='KEY=VALUE',
+                        help='plugin setting, e.g. charset=cp1252')
+    args = parser.parse_args(argv)
+
+    try:
+        settings = parse_settings(args.setting)
+    except argparse.ArgumentTypeError as e:
+        parser.error(str(e))
+
+    files = collect_files(args.paths, args.pattern)
+    jobs = [(filename, args.type) for filename in files]
+    results = convert_files(jobs, settings, args.output_dir, args.workers,
+                            args.format)
+    print(format_summary(results))
+    return 1 if any(result.error for result in results) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
+
+# vim: tabstop=4 expandtab shiftwidth=4 softtabstop=4 smartindent autoindent
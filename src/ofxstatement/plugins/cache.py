@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+# This file is part of ofxstatement-austrian.
+# See README.rst for more information.
+
+import hashlib
+import os
+import pickle
+import tempfile
+import zlib
+from ofxstatement.plugins.base import StatementRecord
+
+# Bump when parsing changes, so old entries are not used anymore
+CACHE_VERSION = 1
+
+# Default size limit of a cache in bytes
+DEFAULT_MAX_SIZE = 256 << 20
+
+# Settings which do not change the parsed statement
+NEUTRAL_SETTINGS = ('cache', 'cache_size', 'memoize_amounts', 'mmap',
+                    'profile', 'workers')
+
+
+def dump_statement(stmt):
+    """Serialize a statement.
+
+    The fields of StatementRecord lines are stored column by column, which
+    is a lot faster to load than pickled objects. Other lines are pickled as
+    they are.
+    """
+    lines = stmt.lines
+    if not all(type(x) is StatementRecord for x in lines):
+        return pickle.dumps((stmt, None), pickle.HIGHEST_PROTOCOL)
+
+    columns = [[getattr(x, name) for x in lines]
+               for name in StatementRecord.__slots__]
+    stmt.lines = []
+    try:
+        return pickle.dumps((stmt, columns), pickle.HIGHEST_PROTOCOL)
+    finally:
+        stmt.lines = lines
+
+
+def load_statement(data):
+    """Deserialize a statement stored by dump_statement."""
+    stmt, columns = pickle.loads(data)
+    if columns is not None:
+        stmt.lines = [StatementRecord(*values) for values in zip(*columns)]
+    return stmt
+
+
+class ParseCache(object):
+    """An on-disk cache of parsed statements.
+
+    Each statement is stored serialized and compressed in a file named by
+    its key. Reading an entry updates its modification time, and the least
+    recently used entries are removed once the cache grows beyond max_size.
+
+    Entries are unpickled, so the cache directory must not be writable by
+    anyone else.
+    """
+
+    suffix = '.stmt'
+
+    def __init__(self, directory, max_size=None):
+        self.directory = directory
+        self.max_size = max_size or DEFAULT_MAX_SIZE
+        os.makedirs(directory, exist_ok=True)
+
+    @staticmethod
+    def key(filename, plugin_name, settings):
+        """Get the key of a file parsed by a plugin with some settings."""
+        digest = hashlib.sha256()
+        with open(filename, 'rb') as fin:
+            for block in iter(lambda: fin.read(1 << 20), b''):
+                digest.update(block)
+
+        options = sorted((str(key), str(value))
+                         for key, value in settings.items()
+                         if key not in NEUTRAL_SETTINGS)
+        digest.update(repr((CACHE_VERSION, plugin_name, options)).encode())
+        return digest.hexdigest()
+
+    def path(self, key):
+        return os.path.join(self.directory, key + self.suffix)
+
+    def get(self, key):
+        """Get a cached statement, or None."""
+        path = self.path(key)
+        try:
+            with open(path, 'rb') as fin:
+                stmt = load_statement(zlib.decompress(fin.read()))
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+        except (OSError, EOFError, zlib.error, pickle.UnpicklingError):
+            # Broken entry, parse again
+            return None
+        return stmt
+
+    def put(self, key, stmt):
+        """Store a statement and evict old entries if needed."""
+        data = zlib.compress(dump_statement(stmt))
+        fd, tmpname = tempfile.mkstemp(
+            prefix='.', suffix='.tmp', dir=self.directory)
+        try:
+            with os.fdopen(fd, 'wb') as fout:
+                fout.write(data)
+            os.replace(tmpname, self.path(key))
+        except BaseException:
+            os.unlink(tmpname)
+            raise
+        self.evict()
+
+    def evict(self):
+        """Remove the least recently used entries beyond max_size."""
+        entries = []
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith(self.suffix):
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+
+        size = sum(x[1] for x in entries)
+        for _, entry_size, path in sorted(entries):
+            if size <= self.max_size:
+                break
+            try:
+                os.unlink(path)
+            except FileNotFoundError:
+                pass
+            size -= entry_size
+
+# vim: tabstop=4 expandtab shiftwidth=4 softtabstop=4 smartindent autoindent
@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+# This file is part of ofxstatement-austrian.
+# See README.rst for more information.
+
+"""Find re-imported transactions and reversals across statements.
+
+Exports often hold identical transactions, e.g. two "Entgelt Kontoauszug"
+of the same amount on the same day, and exports of overlapping date ranges
+hold the same transactions again. The transactions of an account are grouped
+by date, amount and memo. The n-th transaction of a group within a statement
+is a re-import if an earlier statement already had n transactions of that
+group, otherwise it is new. So the identical transactions of one export are
+all kept, and only as many as were imported before are dropped.
+
+Each transaction is looked up in hash tables: the groups are keyed by the
+hash of the IdEngine and the stored counts of a date are loaded with a
+single query when the date first occurs. The counts of the days which left
+the reversal window are moved to a temporary table until the commit, so
+only the days of one window are held in memory. Reversals are paired while
+the lines are parsed, see DedupIndex.pair.
+"""
+
+import collections
+import datetime
+import sqlite3
+from ofxstatement.plugins.ids import IdEngine
+
+# Maximum number of days between a transaction and its reversal
+REVERSAL_DAYS = 14
+
+
+class DedupIndex(object):
+    """A persistent index of the transaction groups imported before.
+
+    The counts of the groups of a statement are stored on commit. Without a
+    filename, the index is kept in memory, e.g. to pair the reversals of a
+    single statement. The counts of a day are kept in memory while the
+    lines are within the reversal window of it, see evict.
+
+    The reversals of the transactions checked since the last commit are
+    collected in reversals as (id, id) pairs of the earlier and the later
+    transaction.
+    """
+
+    def __init__(self, filename=None, reversal_days=REVERSAL_DAYS):
+        self.connection = sqlite3.connect(filename or ':memory:')
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS imported ("
+            "account_id TEXT NOT NULL, "
+            "date TEXT NOT NULL, "
+            "key TEXT NOT NULL, "
+            "count INTEGER NOT NULL, "
+            "PRIMARY KEY (account_id, date, key)) WITHOUT ROWID")
+        # The counts of the groups of the evicted days, until commit
+        self.connection.execute(
+            "CREATE TEMP TABLE checked ("
+            "account_id TEXT NOT NULL, "
+            "date TEXT NOT NULL, "
+            "key TEXT NOT NULL, "
+            "count INTEGER NOT NULL, "
+            "PRIMARY KEY (account_id, date, key)) WITHOUT ROWID")
+        self.ids = IdEngine()
+        self.window = datetime.timedelta(days=reversal_days)
+        self.reset()
+
+    def reset(self):
+        """Forget the transactions checked since the last commit."""
+        # Counts stored by earlier statements, by (account id, date) and key
+        self.imported = {}
+        # Transactions of each group in this statement, by (account id,
+        # date) and key
+        self.ordinals = {}
+        # The (account id, date) of the days in memory, in the order they
+        # were loaded, with the date of the line which loaded them
+        self.days = collections.deque()
+        with self.connection:
+            self.connection.execute("DELETE FROM checked")
+        # Transactions without a reversal, by account id and amount, and
+        # all of them in the order they were checked
+        self.unpaired = {}
+        self.pending = collections.deque()
+        self.reversals = []
+        self.duplicates = 0
+
+    def check(self, account_id, stmtline):
+        """Check if a statement line was imported before.
+
+        Lines which were not are paired with their reversal.
+        """
+        account_id = account_id or ''
+        self.evict(stmtline.date)
+        day = (account_id, stmtline.date.strftime("%Y-%m-%d"))
+        key = self.ids.generate(stmtline)
+
+        try:
+            imported = self.imported[day]
+            ordinals = self.ordinals[day]
+        except KeyError:
+            imported, ordinals = self.load(day, stmtline.date)
+
+        n = ordinals[key] = ordinals.get(key, 0) + 1
+        if n <= imported.get(key, 0):
+            self.duplicates += 1
+            return True
+
+        self.pair(account_id, stmtline)
+        return False
+
+    def load(self, day, date):
+        """Load the counts of an (account id, date), stored or evicted."""
+        imported = self.imported[day] = dict(self.connection.execute(
+            "SELECT key, count FROM imported "
+            "WHERE account_id = ? AND date = ?", day))
+        ordinals = self.ordinals[day] = dict(self.connection.execute(
+            "SELECT key, count FROM checked "
+            "WHERE account_id = ? AND date = ?", day))
+        if ordinals:
+            self.connection.execute(
+                "DELETE FROM checked WHERE account_id = ? AND date = ?", day)
+        self.days.append((date, day))
+        return imported, ordinals
+
+    def evict(self, date):
+        """Move the counts of the days outside the window of a date.
+
+        They are kept in the temporary table until the commit, and loaded
+        again if a line of such a day follows. Like the unpaired lines, the
+        memory is bounded by the days of a window if the lines are ordered
+        by date.
+        """
+        days = self.days
+        rows = []
+        while days and abs(date - days[0][0]) > self.window:
+            day = days.popleft()[1]
+            del self.imported[day]
+            rows.extend(day + x for x in self.ordinals.pop(day).items())
+        if rows:
+            self.connection.executemany(
+                "INSERT INTO checked (account_id, date, key, count) "
+                "VALUES (?, ?, ?, ?)", rows)
+
+    def pair(self, account_id, stmtline):
+        """Pair a line with an earlier line of the opposite amount.
+
+        The earliest unpaired line of the same account within the reversal
+        window is taken. Lines are dropped from the unpaired ones once a
+        line more than the window apart is checked, so the memory is
+        bounded by the transactions of a window if the lines are ordered by
+        date (in either direction).
+        """
+        date = stmtline.date
+        unpaired = self.unpaired
+        pending = self.pending
+        while pending and abs(date - pending[0][0][0]) > self.window:
+            entry, key = pending.popleft()
+            candidates = unpaired.get(key)
+            if candidates and candidates[0] is entry:
+                self.remove(key, candidates)
+
+        amount = stmtline.amount
+        if not amount:
+            return
+
+        key = (account_id, -amount)
+        candidates = unpaired.get(key)
+        if candidates and abs(date - candidates[0][0]) <= self.window:
+            self.reversals.append((candidates[0][1], stmtline.id))
+            self.remove(key, candidates)
+            return
+
+        key = (account_id, amount)
+        entry = (date, stmtline.id)
+        unpaired.setdefault(key, collections.deque()).append(entry)
+        pending.append((entry, key))
+
+    def remove(self, key, candidates):
+        """Remove the earliest unpaired line of an account and amount."""
+        candidates.popleft()
+        if not candidates:
+            del self.unpaired[key]
+
+    def commit(self):
+        """Store the counts of all groups checked since the last commit."""
+        rows = []
+        for day, ordinals in self.ordinals.items():
+            imported = self.imported[day]
+            for key, n in ordinals.items():
+                if n > imported.get(key, 0):
+                    rows.append(day + (key, n))
+        with self.connection:
+            self.connection.executemany(
+                "INSERT OR REPLACE INTO imported (account_id, date, key, "
+                "count) VALUES (?, ?, ?, ?)", rows)
+            self.connection.execute(
+                "INSERT OR REPLACE INTO imported (account_id, date, key, "
+                "count) SELECT c.account_id, c.date, c.key, c.count "
+                "FROM checked AS c LEFT JOIN imported AS i "
+                "ON i.account_id = c.account_id AND i.date = c.date "
+                "AND i.key = c.key WHERE c.count > IFNULL(i.count, 0)")
+        self.reset()
+
+    def close(self):
+        """Close the index, counts which are not committed are lost."""
+        self.connection.close()
+
+# vim: tabstop=4 expandtab shiftwidth=4 softtabstop=4 smartindent autoindent
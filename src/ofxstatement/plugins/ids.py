@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+# This file is part of ofxstatement-austrian.
+# See README.rst for more information.
+
+import collections
+from hashlib import sha1
+
+# Number of dates whose hash state is kept
+DATE_CACHE_SIZE = 4096
+
+
+class IdEngine(object):
+    """Generate transaction ids of statement lines.
+
+    The ids are the same as the ones of generate_transaction_id, the sha1 of
+    date, memo and amount. The hash state after the date is cached per date,
+    so a date is formatted and hashed only once instead of for every line.
+
+    Identical transactions on the same day (e.g. two fees of the same amount)
+    get the same id. With count_collisions, the n-th of those lines within a
+    statement gets "-n" appended to its id instead, see disambiguate. The
+    numbered lines are counted in collisions.
+    """
+
+    def __init__(self, count_collisions=False):
+        self.count_collisions = count_collisions
+        self.dates = {}
+        self.occurrences = collections.Counter()
+        self.collisions = 0
+
+    def generate(self, stmtline):
+        """Get the id of a statement line."""
+        date = stmtline.date
+        try:
+            h = self.dates[date].copy()
+        except KeyError:
+            assert date is not None
+            if len(self.dates) >= DATE_CACHE_SIZE:
+                self.dates.clear()
+            prefix = self.dates[date] = sha1(
+                date.strftime("%Y-%m-%d %H:%M:%S").encode("utf8"))
+            h = prefix.copy()
+
+        if stmtline.memo is not None:
+            h.update(stmtline.memo.encode("utf8"))
+        if stmtline.amount is not None:
+            h.update(str(stmtline.amount).encode("utf8"))
+        return h.hexdigest()
+
+    def disambiguate(self, id, statement=None):
+        """Number an id if it was seen before in the same statement.
+
+        statement tells the statements of a combined export apart, e.g. by
+        their account id and currency.
+        """
+        if not self.count_collisions:
+            return id
+
+        key = (statement, id)
+        self.occurrences[key] += 1
+        n = self.occurrences[key]
+        if n == 1:
+            return id
+        self.collisions += 1
+        return "{}-{}".format(id, n)
+
+# vim: tabstop=4 expandtab shiftwidth=4 softtabstop=4 smartindent autoindent
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+# This file is part of ofxstatement-austrian.
+# See README.rst for more information.
+
+"""Parse a single large export in chunks, using a process pool.
+
+The file is split at line breaks into chunks, which are parsed by a new
+parser of the same plugin in each worker. The statement lines of the chunks
+are merged in their original order, so balances and transaction ids are the
+same as when the file is parsed sequentially.
+"""
+
+import io
+import mmap
+from concurrent.futures import ProcessPoolExecutor
+from ofxstatement.plugins.reader import iter_bounds
+
+# Number of bytes parsed by a worker at once
+CHUNK_SIZE = 4 << 20
+
+# Settings which must not be applied by the workers
+PARENT_SETTINGS = ('workers', 'seen_index', 'dedup', 'payees', 'cache',
+                   'profile')
+
+
+def split_chunks(filename, chunk_size=CHUNK_SIZE):
+    """Split a file into chunks of whole records.
+
+    Returns (start, end, records) for each chunk, where records is the
+    number of records before the chunk. Records are counted by line breaks,
+    so this assumes there are no line breaks within quoted fields.
+    """
+    with open(filename, 'rb') as fin:
+        fin.seek(0, io.SEEK_END)
+        if not fin.tell():
+            return []
+
+        chunks = []
+        records = 0
+        with mmap.mmap(fin.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            for start, end in iter_bounds(data, chunk_size):
+                chunks.append((start, end, records))
+                records += data[start:end].count(b'\n')
+        return chunks
+
+
+def parse_chunk(plugin_class, settings, filename, start, end, records):
+    """Parse a chunk of a file in a worker.
+
+    Returns the account id and currency detected by the parser, as well as
+    the statement lines of the chunk.
+    """
+    plugin = plugin_class(None, settings)
+    parser = plugin.get_parser(filename)
+    with parser.fin:
+        encoding = parser.fin.encoding
+
+    with open(filename, 'rb') as fin:
+        fin.seek(start)
+        data = fin.read(end - start)
+
+    # Header rules like cur_record == 1 only apply to the first chunk
+    parser.fin = io.StringIO(data.decode(encoding), newline=None)
+    parser.mmap = False
+    parser.cur_record = records
+    lines = list(parser.parse_records())
+    return parser.statement.account_id, parser.statement.currency, lines
+
+
+def parse_chunks(parser, chunk_size=None):
+    """Parse the file of a parser in chunks and yield the statement lines.
+
+    The account id and currency of the statement are set from the first
+    chunk which has them, like the parser does for the first record.
+    """
+    plugin = parser.plugin
+    filename = parser.fin.name
+    settings = {key: value for key, value in plugin.settings.items()
+                if key not in PARENT_SETTINGS}
+
+    chunks = split_chunks(filename, chunk_size or CHUNK_SIZE)
+    if not chunks:
+        return
+    starts, ends, records = zip(*chunks)
+
+    n = len(chunks)
+    stmt = parser.statement
+    with ProcessPoolExecutor(max_workers=parser.workers) as executor:
+        results = executor.map(
+            parse_chunk, [type(plugin)] * n, [settings] * n, [filename] * n,
+            starts, ends, records)
+        for account_id, currency, lines in results:
+            if not stmt.account_id:
+                stmt.account_id = account_id
+            if not stmt.currency:
+                stmt.currency = currency
+            for stmtline in lines:
+                yield stmtline
+
+# vim: tabstop=4 expandtab shiftwidth=4 softtabstop=4 smartindent autoindent
@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+# This file is part of ofxstatement-austrian.
+# See README.rst for more information.
+
+"""Normalize the payees of statement lines with the rules of a rule file.
+
+A rule file is an ini file with a [payees] section. Each option is a payee as
+it should appear in the statement, its value one or more regular expressions
+(one per line) which match the payees given by the bank, ignoring case::
+
+    [payees]
+    Amazon = amazon|amzn
+    Wien Energie =
+        wien energie
+        stadtwerke wien
+
+The first rule of the file which matches anywhere in a payee wins, the same
+as if the rules were tried one by one. Payees which no rule matches are kept.
+
+Most rules contain a literal text which a payee must contain to match, e.g.
+"stadtwerke wien". Each rule is indexed by the three characters of its text
+which the fewest rules have, so for each payee only the rules indexed by one
+of its trigrams are tried, plus those without such a text. The result for
+each payee string is cached, so payees which recur are matched only once.
+"""
+
+import collections
+import configparser
+import hashlib
+import re
+
+# Number of payee strings whose result is cached
+CACHE_SIZE = 65536
+
+# The section of the rule file holding the rules
+SECTION = 'payees'
+
+# Characters with a special meaning in regular expressions
+SPECIAL = set('.^$*+?{}[]|()\\')
+
+
+def literals(pattern):
+    """Get the texts of which a match of a pattern contains one.
+
+    Returns None if this cannot be told from the pattern. Only a plain
+    prefix is taken, e.g. "stadtwerke" from "stadtwerke\\s+wien", and
+    patterns which are plain alternatives like "amazon|amzn" are split.
+    """
+    if '|' in pattern:
+        if SPECIAL.intersection(pattern.replace('|', '')):
+            return None
+        alternatives = pattern.split('|')
+    else:
+        alternatives = [pattern]
+
+    texts = []
+    for alternative in alternatives:
+        text = []
+        for i, c in enumerate(alternative):
+            if c in SPECIAL:
+                if i == 0 and c == '^':
+                    continue
+                if c in '*?{':
+                    # The character before is optional
+                    text = text[:-1]
+                break
+            text.append(c)
+        if len(text) < 3:
+            return None
+        texts.append(''.join(text).lower())
+    return texts
+
+
+def trigrams(text):
+    """Iterate the trigrams of a text, as tuples of three characters."""
+    return zip(text, text[1:], text[2:])
+
+
+class PayeeRules(object):
+    """A compiled set of payee rules.
+
+    rules is a list of (payee, patterns). The number of lines whose payee
+    was replaced by each rule is counted in hits.
+    """
+
+    def __init__(self, rules, cache_size=CACHE_SIZE):
+        self.names = []
+        self.regexes = []
+        texts = []
+        for name, patterns in rules:
+            for pattern in patterns:
+                try:
+                    regex = re.compile(pattern, re.IGNORECASE)
+                except re.error as e:
+                    raise ValueError("Invalid rule for payee {}: {}".format(
+                        name, e))
+                self.names.append(name)
+                self.regexes.append(regex.search)
+                texts.append(literals(pattern))
+
+        # Index each text by its trigram which the fewest texts have
+        counts = collections.Counter()
+        for alternatives in texts:
+            if alternatives is not None:
+                counts.update(set(trigram for text in alternatives
+                                  for trigram in trigrams(text)))
+        self.index = collections.defaultdict(list)
+        self.unindexed = []
+        for n, alternatives in enumerate(texts):
+            if alternatives is None:
+                self.unindexed.append(n)
+                continue
+            for text in alternatives:
+                trigram = min(trigrams(text), key=counts.__getitem__)
+                if n not in self.index[trigram]:
+                    self.index[trigram].append(n)
+        self.index = dict(self.index)
+        self.trigrams = frozenset(self.index)
+        self.digest = hashlib.sha1(repr(rules).encode('utf8')).hexdigest()
+        self.cache_size = cache_size
+        self.cache = {}
+        self.hits = collections.Counter()
+
+    @classmethod
+    def load(cls, filename):
+        """Load the rules of a rule file."""
+        config = configparser.ConfigParser(delimiters=('=',),
+                                           interpolation=None)
+        config.optionxform = str
+        with open(filename, encoding='utf8') as fin:
+            config.read_file(fin)
+        if not config.has_section(SECTION):
+            raise ValueError("No [{}] section in {}".format(SECTION,
+                                                            filename))
+
+        return cls([(name, [x.strip() for x in value.splitlines()
+                            if x.strip()])
+                    for name, value in config.items(SECTION)])
+
+    def match(self, payee):
+        """Get the name of the first rule matching a payee, or None."""
+        lowered = payee.lower()
+        found = self.trigrams.intersection(trigrams(lowered))
+        if found:
+            candidates = list(self.unindexed)
+            for trigram in found:
+                candidates.extend(self.index[trigram])
+            candidates.sort()
+        else:
+            candidates = self.unindexed
+
+        for n in candidates:
+            if self.regexes[n](payee):
+                return self.names[n]
+        return None
+
+    def normalize(self, payee):
+        """Get the normalized payee."""
+        if payee is None:
+            return None
+        try:
+            name = self.cache[payee]
+        except KeyError:
+            if len(self.cache) >= self.cache_size:
+                self.cache.clear()
+            name = self.cache[payee] = self.match(payee)
+
+        if name is None:
+            return payee
+        self.hits[name] += 1
+        return name
+
+    def report(self):
+        """Get the hits of all rules in the order of the rule file."""
+        names = collections.OrderedDict.fromkeys(self.names)
+        return [(name, self.hits[name]) for name in names]
+
+# vim: tabstop=4 expandtab shiftwidth=4 softtabstop=4 smartindent autoindent
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+# This file is part of ofxstatement-austrian.
+# See README.rst for more information.
+
+import collections
+import json
+import time
+
+
+class Stage(object):
+    """A context manager adding the time spent in it to a profile."""
+
+    __slots__ = ('timings', 'name', 'start')
+
+    def __init__(self, timings, name):
+        self.timings = timings
+        self.name = name
+        self.start = None
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.timings[self.name] += time.perf_counter() - self.start
+
+
+class Profile(object):
+    """Timings per stage and counters of a parse.
+
+    Parsers only profile if a Profile is set as their profile attribute, so
+    profiling costs nothing but a check for None otherwise. Stages may be
+    nested, e.g. the time of transaction_id is included in parse_record.
+    """
+
+    def __init__(self, filename=None):
+        self.filename = filename
+        self.timings = collections.defaultdict(float)
+        self.counters = collections.Counter()
+        self.stages = {}
+
+    def stage(self, name):
+        """Get a context manager timing a stage."""
+        try:
+            return self.stages[name]
+        except KeyError:
+            stage = self.stages[name] = Stage(self.timings, name)
+            return stage
+
+    def timed(self, iterable, name):
+        """Time the items taken from an iterable as a stage."""
+        items = iter(iterable)
+        timings = self.timings
+        while True:
+            start = time.perf_counter()
+            try:
+                item = next(items)
+            except StopIteration:
+                timings[name] += time.perf_counter() - start
+                return
+            timings[name] += time.perf_counter() - start
+            yield item
+
+    def count(self, name, n=1):
+        """Increment a counter."""
+        self.counters[name] += n
+
+    def to_dict(self):
+        return {
+            'timings': dict(self.timings),
+            'counters': dict(self.counters),
+        }
+
+    def to_json(self):
+        """Export timings (in seconds) and counters as JSON."""
+        return json.dumps(self.to_dict(), indent=2, sort_keys=True)
+
+    def save(self):
+        """Write the profile to its file, if any."""
+        if self.filename:
+            with open(self.filename, 'w') as fout:
+                fout.write(self.to_json())
+
+# vim: tabstop=4 expandtab shiftwidth=4 softtabstop=4 smartindent autoindent
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+# This file is part of ofxstatement-austrian.
+# See README.rst for more information.
+
+"""A memory-mapped reader for semicolon separated exports.
+
+The file is mapped into memory and split into blocks at line breaks. Each
+block is decoded at once, which is cheap for the single-byte encodings of
+the exports (cp1252, iso-8859-1). Blocks without quotes are split with
+str.split, only blocks with quoted fields (e.g. Livebank) go through the
+csv module.
+"""
+
+import csv
+import io
+import mmap
+
+# Number of bytes decoded at once, a block is extended to the next line break
+BLOCK_SIZE = 1 << 20
+
+
+def iter_bounds(data, block_size=BLOCK_SIZE):
+    """Get the (start, end) offsets of blocks of whole lines in a buffer.
+
+    A block is extended while it has an odd number of quotes, so a quoted
+    field with a line break is never cut in two.
+    """
+    pos = 0
+    size = len(data)
+    while pos < size:
+        end = pos + block_size
+        while True:
+            end = data.find(b'\n', end)
+            end = size if end == -1 else end + 1
+            if end == size or not data[pos:end].count(b'"') % 2:
+                break
+        yield pos, end
+        pos = end
+
+
+def iter_blocks(data, block_size=BLOCK_SIZE):
+    """Split a buffer into blocks of whole lines."""
+    for start, end in iter_bounds(data, block_size):
+        yield data[start:end]
+
+
+def split_block(text):
+    """Split a decoded block into records, like csv.reader on a text file."""
+    text = text.replace('\r\n', '\n')
+    if '"' in text:
+        return csv.reader(io.StringIO(text), delimiter=";")
+
+    if text.endswith('\n'):
+        text = text[:-1]
+    return (line.split(';') if line else [] for line in text.split('\n'))
+
+
+def mmap_records(fin, block_size=BLOCK_SIZE):
+    """Split the records of a file using a memory map.
+
+    The file is mapped through its file descriptor and decoded with its
+    encoding, the position of the file is not used.
+    """
+    fin.seek(0, io.SEEK_END)
+    if not fin.tell():
+        return
+
+    with mmap.mmap(fin.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        for block in iter_blocks(data, block_size):
+            for record in split_block(block.decode(fin.encoding)):
+                yield record
+
+# vim: tabstop=4 expandtab shiftwidth=4 softtabstop=4 smartindent autoindent
@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+# This file is part of ofxstatement-austrian.
+# See README.rst for more information.
+
+import sqlite3
+
+
+class SeenIndex(object):
+    """A persistent index of already imported transactions.
+
+    Transactions are keyed by account id and transaction id. Transactions
+    added during an import are only stored on commit, so identical
+    transactions within a single export are not mistaken for each other.
+    """
+
+    def __init__(self, filename):
+        self.connection = sqlite3.connect(filename)
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS seen ("
+            "account_id TEXT NOT NULL, "
+            "id TEXT NOT NULL, "
+            "PRIMARY KEY (account_id, id)) WITHOUT ROWID")
+        self.pending = set()
+
+    def seen(self, account_id, id):
+        """Check if a transaction was imported before."""
+        cursor = self.connection.execute(
+            "SELECT 1 FROM seen WHERE account_id = ? AND id = ?",
+            (account_id or '', id))
+        return cursor.fetchone() is not None
+
+    def add(self, account_id, id):
+        """Remember a transaction, it is stored on commit."""
+        self.pending.add((account_id or '', id))
+
+    def commit(self):
+        """Store all transactions added since the last commit."""
+        with self.connection:
+            self.connection.executemany(
+                "INSERT OR IGNORE INTO seen (account_id, id) VALUES (?, ?)",
+                self.pending)
+        self.pending.clear()
+
+    def close(self):
+        """Close the index, transactions which are not committed are lost."""
+        self.connection.close()
+
+# vim: tabstop=4 expandtab shiftwidth=4 softtabstop=4 smartindent autoindent
@@ -0,0 +1,288 @@
+#!/usr/bin/env python3
+# This file is part of ofxstatement-austrian.
+# See README.rst for more information.
+
+import argparse
+import asyncio
+import collections
+import fnmatch
+import json
+import logging
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from ofxstatement.plugins.auto import PLUGINS
+from ofxstatement.plugins.batch import AUTO, OFX, OUTPUT_FORMATS, \
+    BatchResult, convert_file, output_filename, parse_settings, write_atomic
+
+log = logging.getLogger(__name__)
+
+# Number of latencies kept for the stats
+LATENCY_WINDOW = 1000
+
+# File of the outputs written for each converted file, in the output
+# directory (or the drop directory)
+OUTPUTS_FILE = '.outputs.json'
+
+
+class ImportService(object):
+    """Convert the exports which land in a drop directory to OFX.
+
+    The directory is polled for new or changed files. A file is queued once
+    its size and modification time did not change between two polls, so
+    files are not picked up while they are still being written. The queue is
+    bounded and worked off by as many tasks as the executor has workers.
+
+    The output files of each converted file are recorded in OUTPUTS_FILE,
+    so the files split by account are known to be up to date after a
+    restart.
+    """
+
+    def __init__(self, directory, output_dir=None, plugin_name=AUTO,
+                 settings=None, workers=None, interval=1.0,
+                 pattern='*.csv', stats_file=None, output_format=OFX):
+        self.directory = directory
+        self.output_dir = output_dir
+        self.output_format = output_format
+        self.plugin_name = plugin_name
+        self.settings = dict(settings or {})
+        self.workers = workers or os.cpu_count() or 1
+        self.interval = interval
+        self.pattern = pattern
+        self.stats_file = stats_file
+
+        # Files seen in the last poll, by (size, mtime)
+        self.candidates = {}
+        # Files which are queued or converted, by (size, mtime)
+        self.handled = {}
+        # Time a file was first seen, for the latency, until it is queued
+        self.detected = {}
+        # The outputs of the converted files, by absolute path
+        self.outputs_file = os.path.join(output_dir or directory,
+                                         OUTPUTS_FILE)
+        self.outputs = self.load_outputs()
+
+        self.queue = None
+        self.stopping = None
+        self.converting = 0
+        self.converted = 0
+        self.failed = 0
+        self.latencies = collections.deque(maxlen=LATENCY_WINDOW)
+
+    def load_outputs(self):
+        """Read the outputs recorded by an earlier run, if any."""
+        try:
+            with open(self.outputs_file) as fin:
+                return json.load(fin)
+        except (OSError, ValueError):
+            return {}
+
+    def is_up_to_date(self, filename, mtime):
+        """Check if the output file(s) of a file are newer than the file.
+
+        A file split by account has an OFX file per account instead, those
+        recorded when it was converted.
+        """
+        outputs = self.outputs.get(os.path.abspath(filename)) or [
+            output_filename(filename, self.output_dir, self.output_format)]
+        for name in outputs:
+            try:
+                if os.stat(name).st_mtime >= mtime:
+                    return True
+            except OSError:
+                pass
+        return False
+
+    def scan(self):
+        """Poll the directory and get the files which are ready."""
+        ready = []
+        candidates = {}
+        now = time.monotonic()
+        for entry in sorted(os.scandir(self.directory), key=lambda x: x.name):
+            if not entry.is_file() or entry.name.startswith('.') or \
+                    not fnmatch.fnmatch(entry.name, self.pattern):
+                continue
+
+            stat = entry.stat()
+            key = (stat.st_size, stat.st_mtime)
+            if self.handled.get(entry.path) == key:
+                continue
+            if entry.path not in self.handled and \
+                    self.is_up_to_date(entry.path, stat.st_mtime):
+                self.handled[entry.path] = key
+                continue
+
+            self.detected.setdefault(entry.path, now)
+            if self.candidates.get(entry.path) == key:
+                self.handled[entry.path] = key
+                ready.append(entry.path)
+            else:
+                candidates[entry.path] = key
+
+        self.candidates = candidates
+        return ready
+
+    async def watch(self):
+        """Queue new files until the service is stopped."""
+        while not self.stopping.is_set():
+            for filename in self.scan():
+                # The time goes with the file, it may be queued again while
+                # it is converted
+                await self.queue.put((filename, self.detected.pop(filename)))
+            try:
+                await asyncio.wait_for(
+                    self.stopping.wait(), self.interval)
+            except asyncio.TimeoutError:
+                pass
+
+    async def work(self, executor):
+        """Convert queued files in the executor.
+
+        A file whose conversion raises, e.g. because a worker process was
+        killed, counts as failed and the next file is converted.
+        """
+        loop = asyncio.get_event_loop()
+        while True:
+            filename, detected = await self.queue.get()
+            self.converting += 1
+            start = time.perf_counter()
+            try:
+                result = await loop.run_in_executor(
+                    executor, convert_file, filename, self.plugin_name,
+                    self.settings, self.output_dir, self.output_format)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                result = BatchResult(filename, self.plugin_name, None, 0,
+                                     time.perf_counter() - start,
+                                     '{}: {}'.format(type(e).__name__, e),
+                                     [])
+            finally:
+                self.converting -= 1
+                self.queue.task_done()
+
+            try:
+                self.done(result, detected)
+            except Exception:
+                self.failed += 1
+                log.exception('Failed to record %s', filename)
+
+    def done(self, result, detected):
+        """Account for a converted file, first seen at detected."""
+        latency = time.monotonic() - detected
+        self.latencies.append(latency)
+        if result.error:
+            self.failed += 1
+            log.error('Failed %s (%s): %s', result.filename, result.plugin,
+                      result.error)
+        else:
+            self.outputs[os.path.abspath(result.filename)] = [
+                os.path.abspath(x) for x in result.outputs]
+            write_atomic(self.outputs_file,
+                         json.dumps(self.outputs, indent=2, sort_keys=True))
+            self.converted += 1
+            log.info('Converted %s (%s), %d rows in %.3fs, latency %.3fs, '
+                     'queue depth %d', result.filename, result.plugin,
+                     result.rows, result.seconds, latency,
+                     self.queue.qsize())
+
+        if self.stats_file:
+            write_atomic(self.stats_file, json.dumps(self.stats(), indent=2))
+
+    def stats(self):
+        """Get queue depth, counters and latencies (in seconds)."""
+        latencies = sorted(self.latencies)
+        return {
+            'queue_depth': self.queue.qsize() if self.queue else 0,
+            'converting': self.converting,
+            'converted': self.converted,
+            'failed': self.failed,
+            'latency_mean':
+                sum(latencies) / len(latencies) if latencies else None,
+            'latency_median':
+                latencies[len(latencies) // 2] if latencies else None,
+            'latency_max': latencies[-1] if latencies else None,
+        }
+
+    def stop(self):
+        """Stop polling, files which are queued are still converted."""
+        self.stopping.set()
+
+    async def run(self, executor=None):
+        """Run the service until it is stopped."""
+        self.queue = asyncio.Queue(maxsize=2 * self.workers)
+        self.stopping = asyncio.Event()
+
+        own_executor = executor is None
+        if own_executor:
+            executor = ProcessPoolExecutor(max_workers=self.workers)
+
+        workers = [asyncio.ensure_future(self.work(executor))
+                   for _ in range(self.workers)]
+        try:
+            await self.watch()
+            await self.queue.join()
+        finally:
+            for worker in workers:
+                worker.cancel()
+            await asyncio.wait(workers)
+            if own_executor:
+                executor.shutdown()
+
+
+def main(argv=None):
+    """Watch a directory and convert new bank exports to OFX."""
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument('directory', help='drop directory to watch')
+    parser.add_argument('-t', '--type', default=AUTO,
+                        choices=[AUTO] + list(PLUGINS),
+                        help='plugin to use for all files '
+                             '(default: detect the bank of each file)')
+    parser.add_argument('-o', '--output-dir',
+                        help='directory for the OFX files '
+                             '(default: next to the input file)')
+    parser.add_argument('-f', '--format', default=OFX,
+                        choices=OUTPUT_FORMATS,
+                        help='output format (default: ofx)')
+    parser.add_argument('-j', '--workers', type=int, default=None,
+                        help='number of worker processes '
+                             '(default: number of CPUs)')
+    parser.add_argument('-i', '--interval', type=float, default=1.0,
+                        help='seconds between polls (default: 1)')
+    parser.add_argument('-p', '--pattern', default='*.csv',
+                        help='pattern of the files to convert '
+                             '(default: *.csv)')
+    parser.add_argument('--stats', metavar='FILE',
+                        help='write the stats as JSON after each file')
+    parser.add_argument('-s', '--setting', action='append', default=[],
+                        metavar='KEY=VALUE',
+                        help='plugin setting, e.g. charset=cp1252')
+    args = parser.parse_args(argv)
+
+    try:
+        settings = parse_settings(args.setting)
+    except argparse.ArgumentTypeError as e:
+        parser.error(str(e))
+
+    logging.basicConfig(level=logging.INFO,
+                        format='%(asctime)s %(levelname)s %(message)s')
+    service = ImportService(
+        args.directory, args.output_dir, args.type, settings, args.workers,
+        args.interval, args.pattern, args.stats, args.format)
+
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    try:
+        loop.run_until_complete(service.run())
+    except KeyboardInterrupt:
+        pass
+    finally:
+        loop.close()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
+
+# vim: tabstop=4 expandtab shiftwidth=4 softtabstop=4 smartindent autoindent
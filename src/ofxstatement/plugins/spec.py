@@ -0,0 +1,282 @@
+#!/usr/bin/env python3
+# This file is part of ofxstatement-austrian.
+# See README.rst for more information.
+
+"""Declarative descriptions of the csv exports of a bank.
+
+A FormatSpec lists the columns of an export and the rules to apply to each
+record. It is compiled once into a row function specialized for the format:
+the columns, the header rule and the amount style are fixed in the generated
+code, so no mappings are looked up and no fields are set by name per record.
+"""
+
+from decimal import Decimal
+from ofxstatement.plugins.utils import \
+    clean_multiple_whitespaces, parse_austrian_amount, parse_date
+
+# The function converting an amount string of a style to Decimal, and the
+# string of a zero amount
+AMOUNT_STYLES = {
+    # 1.234,56
+    'austrian': (parse_austrian_amount, '0,00'),
+    # 1234.56
+    'plain': (Decimal, '0.00'),
+}
+
+# Fields of a statement line set by the row functions, passed to the record
+# class as keywords
+FIELDS = ('id', 'date', 'memo', 'amount', 'payee', 'date_user', 'check_no',
+          'refnum')
+
+
+class FormatSpec(object):
+    """The layout of the csv exports of a bank.
+
+    Columns are given by index. The payee may also be a slice of columns,
+    which are joined by ", ". With a credit column, the amount column holds
+    debits and a record is a credit if its debit is zero (e.g. ING-DiBa).
+
+    extract names a parser method which is called with the memo column and
+    returns the values of the fields in extracts, e.g. ('memo', 'payee').
+    Extracted fields are neither cleaned nor generated.
+    """
+
+    def __init__(self, date, amount, memo=None, payee=None, credit=None,
+                 account=None, currency=None, date_format="%d.%m.%Y",
+                 amount_style='austrian', header_rows=0, skip_zero=False,
+                 clean=(), extract=None, extracts=(), encoding='cp1252',
+                 trntype_from_sign=True, generate_id=True):
+        if amount_style not in AMOUNT_STYLES:
+            raise ValueError("Unknown amount style {}".format(amount_style))
+        if extract is None and extracts:
+            raise ValueError("Fields are extracted without a method")
+
+        self.date = date
+        self.amount = amount
+        self.memo = memo
+        self.payee = payee
+        self.credit = credit
+        self.account = account
+        self.currency = currency
+        self.date_format = date_format
+        self.amount_style = amount_style
+        self.header_rows = header_rows
+        self.skip_zero = skip_zero
+        self.clean = tuple(clean)
+        self.extract = extract
+        self.extracts = tuple(extracts)
+        self.encoding = encoding
+        self.trntype_from_sign = trntype_from_sign
+        self.generate_id = generate_id and 'id' not in self.extracts
+        self.factories = {}
+
+    # The names used by the detection of the bank
+    @property
+    def date_column(self):
+        return self.date
+
+    @property
+    def columns(self):
+        """The minimum number of columns of a record."""
+        columns = [self.date, self.amount, self.memo, self.credit,
+                   self.account, self.currency]
+        if isinstance(self.payee, int):
+            columns.append(self.payee)
+        return max(x for x in columns if x is not None) + 1
+
+    def compile(self, memoize_amounts=False, split=False):
+        """Get the factory of the row functions of this format.
+
+        The factory is called with a parser and returns a function which
+        parses a split record into a statement line, or returns None if the
+        record is skipped.
+
+        With memoize_amounts, the amounts are looked up in the amount_table
+        of the parser before they are converted (see amount_source).
+
+        With split, the row function sets the statement of the parser to the
+        one of the account and currency of each record (see add_statement)
+        instead of taking the account and currency of the first record.
+        """
+        split = split and self.account is not None
+        try:
+            return self.factories[memoize_amounts, split]
+        except KeyError:
+            pass
+
+        namespace = {
+            'clean': clean_multiple_whitespaces,
+            'parse_amount': AMOUNT_STYLES[self.amount_style][0],
+            'parse_date': parse_date,
+        }
+        code = compile(self.source(memoize_amounts, split),
+                       '<{!r}>'.format(self), 'exec')
+        exec(code, namespace)
+        factory = self.factories[memoize_amounts, split] = \
+            namespace['make_row']
+        return factory
+
+    def source(self, memoize_amounts=False, split=False):
+        """Generate the source of the row function factory."""
+        src = [
+            "def make_row(parser):",
+            "    stmt = parser.statement",
+            "    record_class = parser.record_class",
+            "    count = parser.count",
+        ]
+        if split:
+            src.append("    statements = parser.statements")
+        if self.extract:
+            src.append("    extract = parser.{}".format(self.extract))
+        if memoize_amounts:
+            src += [
+                "    amounts = parser.amount_table",
+                "    table_size = parser.table_size",
+            ]
+        if self.generate_id:
+            src += [
+                "    if parser.profile is None:",
+                "        transaction_id = parser.ids.generate",
+                "    else:",
+                "        transaction_id = parser.transaction_id",
+            ]
+        src += [
+            "",
+            "    def row(r):",
+        ]
+        body = []
+        if split:
+            body.append("nonlocal stmt")
+        if self.header_rows:
+            body += [
+                "if parser.cur_record <= {}:".format(self.header_rows),
+                "    count('header_rows')",
+                "    return None",
+            ]
+        body += [
+            "if len(r) < {}:".format(self.columns),
+            "    raise ValueError(",
+            "        'Cannot find column {} in line of {{}} items'"
+            ".format(len(r)))".format(self.columns - 1),
+        ]
+        body += self.amount_source(memoize_amounts)
+        if split:
+            # Switch statements only if the account or currency changes
+            account = "r[{}]".format(self.account)
+            currency = "None" if self.currency is None \
+                else "r[{}]".format(self.currency)
+            body += [
+                "if {} != stmt.account_id or {} != stmt.currency:".format(
+                    account, currency),
+                "    key = ({}, {})".format(account, currency),
+                "    stmt = statements.get(key)",
+                "    if stmt is None:",
+                "        stmt = parser.add_statement(*key)",
+                "    parser.statement = stmt",
+            ]
+        if self.account is not None and not split:
+            body += [
+                "if not stmt.account_id:",
+                "    stmt.account_id = r[{}]".format(self.account),
+            ]
+        if self.currency is not None and not split:
+            body += [
+                "if not stmt.currency:",
+                "    stmt.currency = r[{}]".format(self.currency),
+            ]
+        body += [
+            "date = parse_date(r[{}], {!r})".format(self.date,
+                                                    self.date_format),
+        ]
+
+        values = dict.fromkeys(FIELDS, 'None')
+        if self.extract:
+            body.append("{} = extract(r[{}])".format(
+                ", ".join(self.extracts) + ("," if len(self.extracts) == 1
+                                            else ""), self.memo))
+            for field in self.extracts:
+                values[field] = field
+        for field in ('memo', 'payee'):
+            column = getattr(self, field)
+            if column is None or field in self.extracts:
+                continue
+            if isinstance(column, slice):
+                value = '", ".join(r[{}:{}])'.format(
+                    column.start or '', '' if column.stop is None
+                    else column.stop)
+            else:
+                value = "r[{}]".format(column)
+            if field in self.clean:
+                value = "clean({})".format(value)
+            values[field] = value
+        values['date'] = 'date'
+        values['amount'] = 'amount'
+
+        if self.trntype_from_sign:
+            trntype = "'DEBIT' if amount < 0 else 'CREDIT'"
+        else:
+            trntype = "'CHECK'"
+        body.append("stmtline = record_class({}, trntype={})".format(
+            ", ".join("{}={}".format(x, values[x]) for x in FIELDS),
+            trntype))
+        if self.generate_id:
+            body.append("stmtline.id = transaction_id(stmtline)")
+        body.append("return stmtline")
+
+        src += ["        " + x for x in body]
+        src += [
+            "",
+            "    return row",
+        ]
+        return "\n".join(src) + "\n"
+
+    def amount_source(self, memoize_amounts):
+        """Generate the conversion of the amount (before other fields).
+
+        Zero amounts are recognized by their string, before conversion. With
+        memoize_amounts, an amount which is not in the table of the parser is
+        converted and added, and the table is emptied once it holds
+        table_size values. Amounts which cannot be converted raise as without
+        the table.
+        """
+        zero = AMOUNT_STYLES[self.amount_style][1]
+        body = ["value = r[{}]".format(self.amount)]
+        if self.credit is not None:
+            body += [
+                "if value == {!r}:".format(zero),
+                "    value = r[{}]".format(self.credit),
+                "    negate = False",
+                "else:",
+                "    negate = True",
+            ]
+        elif self.skip_zero:
+            body += [
+                "if value == {!r}:".format(zero),
+                "    count('zero_amount_rows')",
+                "    return None",
+            ]
+
+        if memoize_amounts:
+            body += [
+                "amount = amounts.get(value)",
+                "if amount is None:",
+                "    amount = parse_amount(value)",
+                "    if len(amounts) >= table_size:",
+                "        amounts.clear()",
+                "    amounts[value] = amount",
+            ]
+        else:
+            body.append("amount = parse_amount(value)")
+        if self.credit is not None:
+            body += [
+                "if negate:",
+                "    amount = amount.copy_negate()",
+            ]
+        return body
+
+    def __repr__(self):
+        return "<{} date={} amount={} memo={} payee={}>".format(
+            type(self).__name__, self.date, self.amount, self.memo,
+            self.payee)
+
+# vim: tabstop=4 expandtab shiftwidth=4 softtabstop=4 smartindent autoindent
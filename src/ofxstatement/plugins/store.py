@@ -0,0 +1,313 @@
+#!/usr/bin/env python3
+# This file is part of ofxstatement-austrian.
+# See README.rst for more information.
+
+"""A columnar store of the lines of a parsed statement, for fast queries.
+
+Each field of the lines is kept in a column: dates as days (proleptic
+Gregorian ordinals), amounts as cents in an array of 64 bit integers, and
+memos, payees and other repeated texts as indexes into a table of distinct
+strings. The rows are indexed by date, so date ranges are found by bisection
+and texts are searched once per distinct string instead of once per line.
+The lines are restored exactly by to_lines.
+"""
+
+from array import array
+import bisect
+import collections
+import datetime
+from decimal import Decimal
+from ofxstatement.plugins.base import StatementRecord
+from ofxstatement.statement import Statement
+
+# The fields of the lines stored as indexes into the string table
+TEXT_FIELDS = ('memo', 'payee', 'trntype', 'check_no', 'refnum')
+
+# The fields a line may have, the ones of StatementRecord
+FIELDS = frozenset(StatementRecord.__slots__)
+
+# The day stored for a missing date_user
+NO_DAY = 0
+
+# The numpy module once imported, None if it is not installed
+numpy = False
+
+
+def get_numpy():
+    """Import NumPy on first use, it is only needed for monthly_totals."""
+    global numpy
+    if numpy is False:
+        try:
+            import numpy as module
+        except ImportError:  # pragma: no cover
+            module = None
+        numpy = module
+    return numpy
+
+
+def to_day(value):
+    """Get the day of a datetime, which must not have a time."""
+    if value.hour or value.minute or value.second or value.microsecond or \
+            value.tzinfo is not None:
+        raise ValueError("Cannot store the time of {}".format(value))
+    return value.toordinal()
+
+
+class StatementStore(object):
+    """The lines of a statement stored column by column.
+
+    Rows are numbered in the order of the lines. Queries return lists of
+    rows in the order of their dates (lines of the same day in their
+    original order), which are turned into lines by to_lines.
+    """
+
+    def __init__(self, statement=None):
+        # The statement without its lines
+        self.statement = statement or Statement()
+        self.ids = []
+        self.days = array('i')
+        self.user_days = array('i')
+        self.cents = array('q')
+        # Amounts which differ from their cents in exponent or sign, e.g.
+        # Decimal('5') or Decimal('-0.00'), by row
+        self.exact = {}
+        # The distinct strings, None is always 0
+        self.strings = [None]
+        self.string_ids = {None: 0}
+        # The lowercase strings, None as empty, added on the next search
+        self.lowered = ['']
+        self.texts = {name: array('i') for name in TEXT_FIELDS}
+        self.order = None
+        self.sorted_days = None
+
+    @classmethod
+    def from_statement(cls, stmt):
+        """Store the lines of a statement."""
+        header = Statement(stmt.bank_id, stmt.account_id, stmt.currency,
+                           stmt.account_type)
+        header.__dict__.update((key, value)
+                               for key, value in vars(stmt).items()
+                               if key not in ('lines', 'invest_lines'))
+        store = cls(header)
+        store.extend(stmt.lines)
+        return store
+
+    @classmethod
+    def from_parser(cls, parser):
+        """Parse the file of a parser into a store.
+
+        The lines are stored while they are parsed (see iter_lines), so they
+        are not collected in a list first.
+        """
+        store = cls(parser.statement)
+        store.extend(parser.iter_lines())
+        return store
+
+    def intern(self, value):
+        """Get the index of a string in the string table."""
+        try:
+            return self.string_ids[value]
+        except KeyError:
+            n = self.string_ids[value] = len(self.strings)
+            self.strings.append(value)
+            return n
+
+    def extend(self, stmtlines):
+        """Append statement lines."""
+        intern = self.intern
+        texts = [(name, self.texts[name].append) for name in TEXT_FIELDS]
+        add_day = self.days.append
+        add_user_day = self.user_days.append
+        add_cents = self.cents.append
+        add_id = self.ids.append
+        row = len(self.ids)
+        for stmtline in stmtlines:
+            extra = set(getattr(stmtline, '__dict__', ())) - FIELDS
+            if extra:
+                raise ValueError("Cannot store the fields {} of {}".format(
+                    ", ".join(sorted(extra)), stmtline))
+
+            amount = stmtline.amount
+            cents = int(amount.scaleb(2))
+            if amount.as_tuple()[2] != -2 or not cents:
+                self.check_amount(row, amount, cents)
+
+            add_day(to_day(stmtline.date))
+            date_user = stmtline.date_user
+            add_user_day(NO_DAY if date_user is None else to_day(date_user))
+            add_cents(cents)
+            add_id(stmtline.id)
+            for name, add in texts:
+                add(intern(getattr(stmtline, name)))
+            row += 1
+
+        # Index again on the next query
+        self.order = None
+        self.sorted_days = None
+
+    def check_amount(self, row, amount, cents):
+        """Keep an amount which its cents do not restore exactly."""
+        exact = Decimal(cents).scaleb(-2)
+        if exact != amount:
+            raise ValueError("Cannot store the amount {} in cents".format(
+                amount))
+        if exact.as_tuple() != amount.as_tuple():
+            self.exact[row] = amount
+
+    def __len__(self):
+        return len(self.ids)
+
+    def index(self):
+        """Sort the rows by date, if not done since the last extend."""
+        if self.order is None:
+            days = self.days
+            # Stable, and fast for lines which are already ordered by date
+            self.order = array('i', sorted(range(len(days)),
+                                           key=days.__getitem__))
+            self.sorted_days = array('i', (days[x] for x in self.order))
+        return self.order
+
+    def between(self, start=None, end=None):
+        """Get the rows from the date start to end, both included."""
+        order = self.index()
+        lo = 0 if start is None else bisect.bisect_left(
+            self.sorted_days, start.toordinal())
+        hi = len(order) if end is None else bisect.bisect_right(
+            self.sorted_days, end.toordinal())
+        return order[lo:hi].tolist()
+
+    def select(self, start=None, end=None, sign=None, memo=None,
+               payee=None):
+        """Get the rows matching all of the given conditions.
+
+        sign is -1 for debits and 1 for credits, memo and payee are texts
+        the memo or payee contains, ignoring case.
+        """
+        rows = self.between(start, end)
+        if sign is not None:
+            cents = self.cents
+            if sign < 0:
+                rows = [x for x in rows if cents[x] < 0]
+            else:
+                rows = [x for x in rows if cents[x] > 0]
+        for name, text in (('memo', memo), ('payee', payee)):
+            if text is not None:
+                rows = self.containing(rows, name, text)
+        return rows
+
+    def containing(self, rows, name, text):
+        """Keep the rows whose field contains a text, ignoring case.
+
+        The strings are converted to lowercase once, for all queries.
+        """
+        text = text.lower()
+        lowered = self.lowered
+        lowered.extend(x.lower() for x in self.strings[len(lowered):])
+        column = self.texts[name]
+        return [x for x in rows if text in lowered[column[x]]]
+
+    def total(self, rows=None):
+        """Get the sum of the amounts of some rows, or of all rows."""
+        cents = self.cents
+        if rows is None:
+            total = sum(cents)
+        else:
+            total = sum(cents[x] for x in rows)
+        return Decimal(total).scaleb(-2)
+
+    def monthly_totals(self, rows=None):
+        """Sum the amounts by month and transaction type.
+
+        Returns {(year, month): {trntype: total}}, ordered by month. The
+        amounts are summed by day first, then the days by month.
+        """
+        numpy = get_numpy()
+        if numpy is not None and len(self):
+            daily = self.daily_totals_numpy(numpy, rows)
+        else:
+            daily = self.daily_totals(rows)
+
+        monthly = collections.defaultdict(int)
+        for (day, trntype), amount in daily.items():
+            date = datetime.date.fromordinal(day)
+            monthly[date.year, date.month, self.strings[trntype] or ''] += \
+                amount
+
+        totals = collections.OrderedDict()
+        for year, month, trntype in sorted(monthly):
+            totals.setdefault((year, month), collections.OrderedDict())[
+                trntype or None] = Decimal(
+                    monthly[year, month, trntype]).scaleb(-2)
+        return totals
+
+    def daily_totals(self, rows=None):
+        """Sum the amounts by (day, trntype), where trntype is an index."""
+        days = self.days
+        trntypes = self.texts['trntype']
+        cents = self.cents
+        if rows is not None:
+            days = map(days.__getitem__, rows)
+            trntypes = map(trntypes.__getitem__, rows)
+            cents = map(cents.__getitem__, rows)
+
+        daily = {}
+        for key, amount in zip(zip(days, trntypes), cents):
+            daily[key] = daily.get(key, 0) + amount
+        return daily
+
+    def daily_totals_numpy(self, numpy, rows=None):
+        """Sum the amounts by (day, trntype) with NumPy, see daily_totals.
+
+        The rows are sorted by day and trntype, then each run is summed.
+        """
+        days = numpy.array(self.days, dtype=numpy.int64)
+        trntypes = numpy.array(self.texts['trntype'], dtype=numpy.int64)
+        cents = numpy.array(self.cents, dtype=numpy.int64)
+        if rows is not None:
+            rows = numpy.array(rows, dtype=numpy.intp)
+            days, trntypes, cents = days[rows], trntypes[rows], cents[rows]
+            if not len(rows):
+                return {}
+
+        width = len(self.strings)
+        keys = days * width + trntypes
+        order = numpy.argsort(keys)
+        keys = keys[order]
+        starts = numpy.flatnonzero(numpy.concatenate(
+            ([True], keys[1:] != keys[:-1])))
+        sums = numpy.add.reduceat(cents[order], starts)
+        return {divmod(key, width): amount for key, amount in zip(
+            keys[starts].tolist(), sums.tolist())}
+
+    def to_lines(self, rows=None):
+        """Restore the lines of some rows, or of all rows."""
+        if rows is None:
+            rows = range(len(self))
+        strings = self.strings
+        memos, payees, check_nos, refnums, trntypes = [
+            self.texts[name]
+            for name in ('memo', 'payee', 'check_no', 'refnum', 'trntype')]
+        fromordinal = datetime.datetime.fromordinal
+        lines = []
+        for row in rows:
+            amount = self.exact.get(row)
+            if amount is None:
+                amount = Decimal(self.cents[row]).scaleb(-2)
+            user_day = self.user_days[row]
+            lines.append(StatementRecord(
+                self.ids[row], fromordinal(self.days[row]),
+                strings[memos[row]], amount, strings[payees[row]],
+                None if user_day == NO_DAY else fromordinal(user_day),
+                strings[check_nos[row]], strings[refnums[row]],
+                strings[trntypes[row]]))
+        return lines
+
+    def to_statement(self, rows=None):
+        """Restore the statement, with the lines of some rows or all."""
+        stmt = Statement()
+        stmt.__dict__.update(vars(self.statement))
+        stmt.lines = self.to_lines(rows)
+        stmt.invest_lines = []
+        return stmt
+
+# vim: tabstop=4 expandtab shiftwidth=4 softtabstop=4 smartindent autoindent
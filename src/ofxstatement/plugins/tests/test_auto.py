@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+# This file is part of ofxstatement-austrian.
+# See README.rst for more information.
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from ofxstatement.plugins.auto import AutoPlugin, detect
+from ofxstatement.plugins.easybank import \
+    EasybankCreditCardCsvParser, EasybankGiroCsvParser, EasybankPlugin
+from ofxstatement.plugins.tests.test_base import sample_path
+
+
+class TestDetect(unittest.TestCase):
+    """Unit tests for the detection of banks."""
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def write(self, data):
+        filename = os.path.join(self.tmpdir, 'export.csv')
+        with open(filename, 'wb') as fout:
+            fout.write(data)
+        return filename
+
+    def test_samples(self):
+        expected = {
+            'easybank-creditcard.csv': 'easybank',
+            'easybank-giro.csv': 'easybank',
+            'ing-diba.csv': 'ing-diba',
+            'livebank.csv': 'livebank',
+            'oberbank.csv': 'oberbank',
+            'raiffeisen.csv': 'raiffeisen',
+        }
+        for sample, name in expected.items():
+            with self.subTest(sample=sample):
+                self.assertEqual(detect(sample_path(sample)), name)
+
+    def test_empty_file(self):
+        self.assertRaises(ValueError, detect, self.write(b''))
+
+    def test_unknown_file(self):
+        self.assertRaises(ValueError, detect, self.write(b'foo,bar\n1,2\n'))
+
+    def test_auto_plugin(self):
+        parser = AutoPlugin(None, {}).get_parser(sample_path('ing-diba.csv'))
+        with parser.fin:
+            stmt = parser.parse()
+        self.assertEqual(stmt.bank_id, 'ING-DiBa')
+        self.assertEqual(len(stmt.lines), 6)
+
+
+class TestEasybankDetermineParser(unittest.TestCase):
+    """Unit tests for EasybankPlugin.determine_parser."""
+
+    def determine_parser(self, name):
+        with open(sample_path(name), encoding='cp1252') as fin:
+            parser = EasybankPlugin(None, {}).determine_parser(fin)
+            self.assertEqual(fin.tell(), 0)
+        return parser
+
+    def test_creditcard(self):
+        self.assertIsInstance(self.determine_parser('easybank-creditcard.csv'),
+                              EasybankCreditCardCsvParser)
+
+    def test_giro(self):
+        self.assertIsInstance(self.determine_parser('easybank-giro.csv'),
+                              EasybankGiroCsvParser)
+
+    def test_empty_file(self):
+        with tempfile.TemporaryFile('w+') as fin:
+            self.assertIsInstance(
+                EasybankPlugin(None, {}).determine_parser(fin),
+                EasybankGiroCsvParser)
+
+# vim: tabstop=4 expandtab shiftwidth=4 softtabstop=4 smartindent autoindent
@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+# This file is part of ofxstatement-austrian.
+# See README.rst for more information.
+
+import copy
+import datetime
+from decimal import Decimal
+import io
+import os
+import pickle
+import types
+import unittest
+from unittest import mock
+
+from ofxstatement import statement
+from ofxstatement.statement import StatementLine
+
+from ofxstatement.plugins.base import StatementRecord
+from ofxstatement.plugins.easybank import \
+    EasybankCreditCardCsvParser, EasybankGiroCsvParser, EasybankPlugin
+from ofxstatement.plugins.ingdiba import IngDiBaCsvParser
+from ofxstatement.plugins.livebank import LivebankCsvParser
+from ofxstatement.plugins.oberbank import OberbankCsvParser
+from ofxstatement.plugins.raiffeisen import RaiffeisenCsvParser
+
+SAMPLES = [
+    (EasybankCreditCardCsvParser, 'easybank-creditcard.csv', 'cp1252'),
+    (EasybankGiroCsvParser, 'easybank-giro.csv', 'cp1252'),
+    (IngDiBaCsvParser, 'ing-diba.csv', 'iso-8859-1'),
+    (LivebankCsvParser, 'livebank.csv', 'iso-8859-1'),
+    (OberbankCsvParser, 'oberbank.csv', 'cp1252'),
+    (RaiffeisenCsvParser, 'raiffeisen.csv', 'cp1252'),
+]
+
+
+def sample_path(name):
+    return os.path.join(os.path.dirname(__file__), 'samples', name)
+
+
+class TestIterLines(unittest.TestCase):
+    """Unit tests for the streaming parse mode."""
+
+    def test_iter_lines_is_a_generator(self):
+        with open(sample_path('raiffeisen.csv'), encoding='cp1252') as fin:
+            lines = RaiffeisenCsvParser(fin).iter_lines()
+            self.assertIsInstance(lines, types.GeneratorType)
+
+    def test_iter_lines_matches_parse(self):
+        for parser_class, sample, encoding in SAMPLES:
+            with self.subTest(parser=parser_class.__name__):
+                with open(sample_path(sample), encoding=encoding) as fin:
+                    expected = parser_class(fin).parse()
+                with open(sample_path(sample), encoding=encoding) as fin:
+                    parser = parser_class(fin)
+                    lines = list(parser.iter_lines())
+
+                stmt = parser.statement
+                self.assertEqual(stmt.lines, [])
+                self.assertEqual(
+                    [(x.id, x.date, x.amount, x.memo) for x in lines],
+                    [(x.id, x.date, x.amount, x.memo)
+                     for x in expected.lines])
+                self.assertEqual(stmt.start_balance, expected.start_balance)
+                self.assertEqual(stmt.end_balance, expected.end_balance)
+                self.assertEqual(stmt.start_date, expected.start_date)
+                self.assertEqual(stmt.end_date, expected.end_date)
+                self.assertEqual(stmt.account_id, expected.account_id)
+                self.assertEqual(stmt.currency, expected.currency)
+
+
+class UnreadLines(list):
+    """Statement lines which must not be iterated."""
+
+    def __iter__(self):
+        raise AssertionError("The statement lines are read again")
+
+
+class TestSinglePassTotals(unittest.TestCase):
+    """The totals are computed while parsing, without a second pass."""
+
+    def test_same_totals_as_recalculate_balance(self):
+        for parser_class, sample, encoding in SAMPLES:
+            with self.subTest(parser=parser_class.__name__):
+                with open(sample_path(sample), encoding=encoding) as fin:
+                    parser = parser_class(fin)
+                    parser.statement.lines = UnreadLines()
+                    with mock.patch.object(
+                            parser_class, 'update_totals', autospec=True,
+                            side_effect=parser_class.update_totals) as update:
+                        stmt = parser.parse()
+
+                # Each line updates the totals once, and the lines are not
+                # read again after they are parsed
+                self.assertEqual(update.call_count, len(stmt.lines))
+                expected = copy.copy(stmt)
+                expected.lines = stmt.lines[:]
+                statement.recalculate_balance(expected)
+                self.assertEqual(stmt.start_balance, expected.start_balance)
+                self.assertEqual(stmt.end_balance, expected.end_balance)
+                self.assertEqual(stmt.start_date, expected.start_date)
+                self.assertEqual(stmt.end_date, expected.end_date)
+
+    def test_start_balance_is_kept(self):
+        with open(sample_path('raiffeisen.csv'), encoding='cp1252') as fin:
+            parser = RaiffeisenCsvParser(fin)
+            parser.statement.start_balance = Decimal('100.00')
+            stmt = parser.parse()
+        self.assertEqual(stmt.start_balance, Decimal('100.00'))
+        self.assertEqual(stmt.end_balance, Decimal('-57.89'))
+
+    def test_empty_statement(self):
+        stmt = RaiffeisenCsvParser([]).parse()
+        self.assertEqual(stmt.lines, [])
+        self.assertEqual(stmt.end_balance, Decimal(0))
+        self.assertIsNone(stmt.start_date)
+        self.assertIsNone(stmt.end_date)
+
+
+class TestStatementRecord(unittest.TestCase):
+    """Unit tests for the compact statement lines."""
+
+    def setUp(self):
+        with open(sample_path('easybank-giro.csv'), encoding='cp1252') as fin:
+            self.statement = EasybankGiroCsvParser(fin).parse()
+
+    def test_parsers_build_records(self):
+        for line in self.statement.lines:
+            self.assertIsInstance(line, StatementRecord)
+            self.assertIsInstance(line, StatementLine)
+
+    def test_defaults(self):
+        record = StatementRecord()
+        self.assertEqual(record.trntype, "CHECK")
+        self.assertIsNone(record.bank_account_to)
+        self.assertIsNone(record.payee)
+
+    def test_pickle(self):
+        line = self.statement.lines[2]
+        copy = pickle.loads(pickle.dumps(line))
+        for field in StatementRecord.__slots__:
+            self.assertEqual(getattr(copy, field), getattr(line, field))
+
+    def test_other_attributes(self):
+        record = StatementRecord()
+        record.currency = "EUR"
+        self.assertEqual(record.currency, "EUR")
+
+
+class TestParseStatements(unittest.TestCase):
+    """Combined exports are split by account and currency."""
+
+    ING = """\
+Kontonummer;Text;Datum;Währung;Soll;Haben
+111;Habenzinsen;31.12.2013;EUR;0,00;12,23
+222;Miete;02.01.2014;EUR;500,00;0,00
+111;Kapitalertragsteuer;31.12.2013;EUR;3,06;0,00
+222;Gehalt;01.01.2014;EUR;0,00;1.000,00
+222;Card;03.01.2014;USD;10,00;0,00
+"""
+
+    def test_split(self):
+        parser = IngDiBaCsvParser(io.StringIO(self.ING))
+        parser.statement.bank_id = 'ING-DiBa'
+        statements = parser.parse_statements()
+
+        self.assertEqual([(x.account_id, x.currency) for x in statements],
+                         [('111', 'EUR'), ('222', 'EUR'), ('222', 'USD')])
+        self.assertEqual([len(x.lines) for x in statements], [2, 2, 1])
+        self.assertEqual([x.end_balance for x in statements],
+                         [Decimal('9.17'), Decimal('500.00'),
+                          Decimal('-10.00')])
+        self.assertEqual(statements[1].start_date,
+                         datetime.datetime(2014, 1, 1))
+        self.assertEqual(statements[1].end_date,
+                         datetime.datetime(2014, 1, 2))
+        self.assertEqual(statements[2].bank_id, 'ING-DiBa')
+        self.assertEqual(parser.statement.lines, [])
+
+    def test_single_account(self):
+        for parser_class, sample, encoding in SAMPLES:
+            with self.subTest(parser=parser_class.__name__):
+                with open(sample_path(sample), encoding=encoding) as fin:
+                    expected = parser_class(fin).parse()
+                with open(sample_path(sample), encoding=encoding) as fin:
+                    statements = parser_class(fin).parse_statements()
+
+                self.assertEqual(len(statements), 1)
+                stmt = statements[0]
+                self.assertEqual([repr(x) for x in stmt.lines],
+                                 [repr(x) for x in expected.lines])
+                self.assertEqual(stmt.account_id, expected.account_id)
+                self.assertEqual(stmt.currency, expected.currency)
+                self.assertEqual(stmt.end_balance, expected.end_balance)
+                self.assertEqual(stmt.end_date, expected.end_date)
+
+    def test_empty(self):
+        parser = IngDiBaCsvParser(io.StringIO(''))
+        self.assertEqual(parser.parse_statements(), [parser.statement])
+
+
+class TestAustrianPlugin(unittest.TestCase):
+    """Unit tests for the plugin base."""
+
+    def test_iter_lines(self):
+        plugin = EasybankPlugin(None, {})
+        lines = list(plugin.iter_lines(sample_path('easybank-giro.csv')))
+        self.assertEqual(len(lines), 10)
+        self.assertEqual(lines[0].memo, "Einbehaltene KESt")
+
+# vim: tabstop=4 expandtab shiftwidth=4 softtabstop=4 smartindent autoindent
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+# This file is part of ofxstatement-austrian.
+# See README.rst for more information.
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from ofxstatement.plugins.batch import \
+    collect_files, convert_files, format_summary, main
+
+SAMPLES = os.path.join(os.path.dirname(__file__), 'samples')
+
+
+class TestBatch(unittest.TestCase):
+    """Unit tests for the batch conversion."""
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.jobs = [
+            (os.path.join(SAMPLES, 'easybank-giro.csv'), 'easybank'),
+            (os.path.join(SAMPLES, 'ing-diba.csv'), 'ing-diba'),
+            (os.path.join(SAMPLES, 'livebank.csv'), 'livebank'),
+            (os.path.join(SAMPLES, 'raiffeisen.csv'), 'raiffeisen'),
+            (os.path.join(SAMPLES, 'oberbank.csv'), 'oberbank'),
+        ]
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def test_collect_files(self):
+        files = collect_files([SAMPLES])
+        self.assertEqual(len(files), 6)
+        self.assertEqual(files, sorted(files))
+
+    def test_collect_files_skips_outputs(self):
+        for name in ('raiffeisen.csv', 'raiffeisen.ofx', 'notes.txt'):
+            open(os.path.join(self.tmpdir, name), 'w').close()
+        os.mkdir(os.path.join(self.tmpdir, 'old.csv'))
+        self.assertEqual(collect_files([self.tmpdir]),
+                         [os.path.join(self.tmpdir, 'raiffeisen.csv')])
+        self.assertEqual(len(collect_files([self.tmpdir], '*')), 3)
+
+    def test_main_twice_on_directory(self):
+        shutil.copy(os.path.join(SAMPLES, 'raiffeisen.csv'), self.tmpdir)
+        shutil.copy(os.path.join(SAMPLES, 'livebank.csv'), self.tmpdir)
+        for _ in range(2):
+            self.assertEqual(main(['-j', '1', self.tmpdir]), 0)
+        self.assertEqual(sorted(os.listdir(self.tmpdir)), [
+            'livebank.csv', 'livebank.ofx', 'raiffeisen.csv',
+            'raiffeisen.ofx'])
+
+    def test_convert_files_in_process(self):
+        results = convert_files(self.jobs, output_dir=self.tmpdir, workers=1)
+        self.assertEqual([r.rows for r in results], [10, 6, 3, 7, 5])
+        self.assertEqual([r.error for r in results], [None] * 5)
+        for result in results:
+            with open(result.output, encoding='utf-8') as fin:
+                self.assertIn('<OFX>', fin.read())
+
+    def test_convert_files_in_pool(self):
+        results = convert_files(self.jobs, output_dir=self.tmpdir, workers=2)
+        self.assertEqual([r.filename for r in results],
+                         [filename for filename, _ in self.jobs])
+        self.assertEqual([r.rows for r in results], [10, 6, 3, 7, 5])
+
+    def test_failed_file_is_reported(self):
+        jobs = [(os.path.join(SAMPLES, 'livebank.csv'), 'easybank')]
+        results = convert_files(jobs, output_dir=self.tmpdir, workers=1)
+        self.assertIsNone(results[0].output)
+        self.assertIsNotNone(results[0].error)
+        self.assertIn('1 failed', format_summary(results))
+
+    def test_detect_banks(self):
+        jobs = [(filename, 'auto') for filename, _ in self.jobs]
+        results = convert_files(jobs, output_dir=self.tmpdir, workers=1)
+        self.assertEqual([r.plugin for r in results],
+                         [name for _, name in self.jobs])
+
+    def test_split_accounts(self):
+        filename = os.path.join(self.tmpdir, 'combined.csv')
+        with open(os.path.join(SAMPLES, 'ing-diba.csv'), 'rb') as fin:
+            data = fin.read()
+        with open(filename, 'wb') as fout:
+            fout.write(data + data.splitlines(True)[1].replace(
+                b'12345678001', b'12345678002'))
+
+        jobs = [(filename, 'ing-diba')]
+        results = convert_files(jobs, {'split_accounts': 'yes'},
+                                output_dir=self.tmpdir, workers=1)
+        self.assertIsNone(results[0].error)
+        self.assertEqual(results[0].rows, 7)
+        self.assertEqual(sorted(x for x in os.listdir(self.tmpdir)
+                                if x.endswith('.ofx')),
+                         ['combined-12345678001.ofx',
+                          'combined-12345678002.ofx'])
+
+    def test_main(self):
+        path = os.path.join(SAMPLES, 'raiffeisen.csv')
+        rc = main(['-t', 'raiffeisen', '-j', '1', '-o', self.tmpdir, path])
+        self.assertEqual(rc, 0)
+        self.assertTrue(
+            os.path.exists(os.path.join(self.tmpdir, 'raiffeisen.ofx')))
+
+# vim: tabstop=4 expandtab shiftwidth=4 softtabstop=4 smartindent autoindent
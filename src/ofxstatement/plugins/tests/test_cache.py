@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+# This file is part of ofxstatement-austrian.
+# See README.rst for more information.
+
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+from ofxstatement.statement import Statement, StatementLine
+
+from ofxstatement.plugins.base import AustrianCsvParser
+from ofxstatement.plugins.cache import \
+    ParseCache, dump_statement, load_statement
+from ofxstatement.plugins.livebank import LivebankPlugin
+from ofxstatement.plugins.tests.test_base import sample_path
+
+
+class TestParseCache(unittest.TestCase):
+    """Unit tests for ParseCache."""
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.csvfile = os.path.join(self.tmpdir, 'livebank.csv')
+        shutil.copy(sample_path('livebank.csv'), self.csvfile)
+        self.cachedir = os.path.join(self.tmpdir, 'cache')
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def parse(self, **settings):
+        settings.setdefault('cache', self.cachedir)
+        parser = LivebankPlugin(None, settings).get_parser(self.csvfile)
+        with parser.fin:
+            return parser.parse()
+
+    def test_cached_statement(self):
+        expected = self.parse()
+        with mock.patch.object(AustrianCsvParser, 'iter_lines') as lines:
+            stmt = self.parse()
+        lines.assert_not_called()
+
+        self.assertEqual([(x.id, x.date, x.amount, x.payee)
+                          for x in stmt.lines],
+                         [(x.id, x.date, x.amount, x.payee)
+                          for x in expected.lines])
+        self.assertEqual(stmt.end_balance, expected.end_balance)
+        self.assertEqual(stmt.account_id, expected.account_id)
+        self.assertEqual(stmt.bank_id, 'Livebank')
+
+    def test_key_on_parse(self):
+        with mock.patch.object(ParseCache, 'key',
+                               return_value='livebank') as key:
+            parser = LivebankPlugin(None, {'cache': self.cachedir}) \
+                .get_parser(self.csvfile)
+            with parser.fin:
+                key.assert_not_called()
+                parser.parse()
+        key.assert_called_once_with(self.csvfile, 'LivebankPlugin',
+                                    {'cache': self.cachedir})
+        self.assertTrue(os.path.exists(parser.cache.path('livebank')))
+
+    def test_key(self):
+        key = ParseCache.key(self.csvfile, 'LivebankPlugin', {})
+        self.assertEqual(
+            ParseCache.key(self.csvfile, 'LivebankPlugin', {'mmap': 'yes'}),
+            key)
+        self.assertNotEqual(
+            ParseCache.key(self.csvfile, 'LivebankPlugin', {'bank': 'x'}),
+            key)
+        self.assertNotEqual(
+            ParseCache.key(self.csvfile, 'EasybankPlugin', {}), key)
+
+        with open(self.csvfile, 'a', encoding='iso-8859-1') as fout:
+            fout.write('\n')
+        self.assertNotEqual(
+            ParseCache.key(self.csvfile, 'LivebankPlugin', {}), key)
+
+    def test_changed_file(self):
+        self.parse()
+        with open(self.csvfile, 'a', encoding='iso-8859-1') as fout:
+            fout.write('12345678;1;2013-07-04;2013-07-04;'
+                       '2013-07-04-08.21.36.47192;"";EUR;1,00;"x";"y"\n')
+        self.assertEqual(len(self.parse().lines), 4)
+
+    def test_not_with_seen_index(self):
+        seen_index = os.path.join(self.tmpdir, 'seen.sqlite')
+        self.assertEqual(len(self.parse(seen_index=seen_index).lines), 3)
+        self.assertEqual(self.parse(seen_index=seen_index).lines, [])
+        self.assertFalse(os.path.exists(self.cachedir))
+
+    def test_dump_and_load(self):
+        stmt = self.parse(cache=None)
+        copy = load_statement(dump_statement(stmt))
+        self.assertEqual(len(stmt.lines), 3)
+        for line, copied in zip(stmt.lines, copy.lines):
+            self.assertEqual(repr(copied), repr(line))
+        self.assertEqual(copy.end_date, stmt.end_date)
+
+        stmt = Statement()
+        stmt.lines.append(StatementLine('id', None, 'memo'))
+        copy = load_statement(dump_statement(stmt))
+        self.assertEqual(copy.lines[0].memo, 'memo')
+
+    def test_broken_entry(self):
+        cache = ParseCache(self.cachedir)
+        with open(cache.path('broken'), 'wb') as fout:
+            fout.write(b'broken')
+        self.assertIsNone(cache.get('broken'))
+        self.assertIsNone(cache.get('missing'))
+
+    def test_evict_least_recently_used(self):
+        cache = ParseCache(self.cachedir, max_size=2000)
+        stmt = self.parse(cache=None)
+        for age, key in enumerate(('a', 'b', 'c')):
+            cache.put(key, stmt)
+            os.utime(cache.path(key), (1000 + age, 1000 + age))
+        size = os.path.getsize(cache.path('a'))
+        self.assertLess(size, 700)
+
+        self.assertIsNotNone(cache.get('a'))
+        cache.max_size = 2 * size
+        cache.evict()
+        self.assertEqual(sorted(os.listdir(self.cachedir)),
+                         ['a.stmt', 'c.stmt'])
+
+# vim: tabstop=4 expandtab shiftwidth=4 softtabstop=4 smartindent autoindent
@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+# This file is part of ofxstatement-austrian.
+# See README.rst for more information.
+
+import collections
+from datetime import datetime
+from decimal import Decimal
+import os
+import shutil
+import tempfile
+import unittest
+
+from ofxstatement.plugins.base import StatementRecord
+from ofxstatement.plugins.dedup import DedupIndex
+from ofxstatement.plugins.raiffeisen import RaiffeisenPlugin
+from ofxstatement.plugins.tests.test_base import sample_path
+
+FEE = ('05.07.2013;"Entgelt Kontoauszug";05.07.2013;-0,11;EUR;'
+       '05.07.2013 00:00:31:010;\n')
+
+
+def line(day, amount, memo='Entgelt', id=None):
+    return StatementRecord(id or '{}{}'.format(day, amount),
+                           datetime(2013, 7, day), memo, Decimal(amount))
+
+
+class TestDedupIndex(unittest.TestCase):
+    """Unit tests for DedupIndex."""
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.filename = os.path.join(self.tmpdir, 'dedup.sqlite')
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def check(self, index, lines, account_id='account'):
+        return [index.check(account_id, x) for x in lines]
+
+    def test_ordinals(self):
+        index = DedupIndex(self.filename)
+        self.assertEqual(
+            self.check(index, [line(1, '-0.11'), line(1, '-0.11')]),
+            [False, False])
+        index.commit()
+        index.close()
+
+        index = DedupIndex(self.filename)
+        lines = [line(1, '-0.11'), line(1, '-0.11'), line(1, '-0.11'),
+                 line(1, '-0.11', 'Other'), line(2, '-0.11')]
+        self.assertEqual(self.check(index, lines),
+                         [True, True, False, False, False])
+        self.assertEqual(index.duplicates, 2)
+        self.assertEqual(self.check(index, lines[:1], 'other'), [False])
+        index.commit()
+
+        self.assertEqual(self.check(index, lines),
+                         [True, True, True, True, True])
+        index.close()
+
+    def test_not_stored_without_commit(self):
+        index = DedupIndex(self.filename)
+        self.check(index, [line(1, '5.00')])
+        index.close()
+
+        index = DedupIndex(self.filename)
+        self.assertEqual(self.check(index, [line(1, '5.00')]), [False])
+        index.close()
+
+    def test_evicted_days(self):
+        index = DedupIndex(self.filename, reversal_days=3)
+        lines = [line(x, '-0.11') for x in range(1, 31)]
+        self.assertEqual(self.check(index, lines), [False] * 30)
+        self.assertEqual(sorted(index.ordinals),
+                         [('account', '2013-07-{}'.format(x))
+                          for x in range(27, 31)])
+        self.assertEqual(len(index.imported), 4)
+        # An evicted day is loaded again with its counts
+        self.assertEqual(self.check(index, [line(1, '-0.11')]), [False])
+        self.assertEqual(index.ordinals['account', '2013-07-01'],
+                         {index.ids.generate(line(1, '-0.11')): 2})
+        index.commit()
+        index.close()
+
+        index = DedupIndex(self.filename, reversal_days=3)
+        self.assertEqual(
+            self.check(index, lines + [line(1, '-0.11'), line(1, '-0.11')]),
+            [True] * 31 + [False])
+        index.close()
+
+    def test_reversals(self):
+        index = DedupIndex()
+        self.check(index, [
+            line(1, '-20.00', id='a'),
+            line(1, '-20.00', id='b'),
+            line(2, '20.00', 'Storno', id='c'),
+            line(3, '7.00', id='d'),
+            line(3, '-7.00', id='e'),
+            line(4, '0.00', id='f'),
+            line(5, '0.00', id='g'),
+        ])
+        self.assertEqual(index.reversals, [('a', 'c'), ('d', 'e')])
+        self.assertEqual(index.unpaired, {
+            ('account', Decimal('-20.00')): collections.deque(
+                [(datetime(2013, 7, 1), 'b')])})
+
+    def test_reversal_window(self):
+        index = DedupIndex(reversal_days=3)
+        self.check(index, [
+            line(1, '-20.00', id='a'),
+            line(2, '-5.00', id='b'),
+            line(5, '20.00', id='c'),
+            line(5, '5.00', id='d'),
+        ])
+        self.assertEqual(index.reversals, [('b', 'd')])
+        self.assertEqual(list(index.unpaired),
+                         [('account', Decimal('20.00'))])
+        self.assertEqual(len(index.pending), 2)
+
+        index.commit()
+        self.assertEqual(index.reversals, [])
+        self.assertEqual(index.unpaired, {})
+
+
+class TestDedupImport(unittest.TestCase):
+    """Overlapping exports are imported once with a dedup index."""
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.csvfile = os.path.join(self.tmpdir, 'raiffeisen.csv')
+        shutil.copy(sample_path('raiffeisen.csv'), self.csvfile)
+        self.plugin = RaiffeisenPlugin(None, {
+            'dedup': os.path.join(self.tmpdir, 'dedup.sqlite')})
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def parse(self):
+        parser = self.plugin.get_parser(self.csvfile)
+        with parser.fin:
+            return parser.parse()
+
+    def append(self, line):
+        with open(self.csvfile, 'a', encoding='cp1252') as fout:
+            fout.write(line)
+
+    def test_reversals(self):
+        with open(self.csvfile, 'w', encoding='cp1252') as fout:
+            fout.write('02.07.2013;"Bestellung";02.07.2013;-20,00;EUR;'
+                       '02.07.2013 10:00:00:000;\n'
+                       '04.07.2013;"Storno Bestellung";04.07.2013;20,00;EUR;'
+                       '04.07.2013 10:00:00:000;\n')
+        parser = self.plugin.get_parser(self.csvfile)
+        with parser.fin:
+            stmt = parser.parse()
+        self.assertEqual(parser.reversals,
+                         [(stmt.lines[0].id, stmt.lines[1].id)])
+        self.assertEqual(parser.dedup.reversals, [])
+
+    def test_overlapping_exports(self):
+        self.append(FEE + FEE)
+        self.assertEqual(len(self.parse().lines), 9)
+        self.assertEqual(self.parse().lines, [])
+
+        self.append(FEE)
+        stmt = self.parse()
+        self.assertEqual(len(stmt.lines), 1)
+        self.assertEqual(stmt.end_balance, Decimal('-0.11'))
+
+# vim: tabstop=4 expandtab shiftwidth=4 softtabstop=4 smartindent autoindent
@@ -182,4 +182,23 @@ class TestEasybankGiroCsvParser(unittest.TestCase):
         self.assertEqual(line.date, datetime.datetime(2015, 10, 7, 0, 0))
         self.assertEqual(line.id, generate_transaction_id(line))
 
+
+class TestEasybankGiroExtractTransaction(unittest.TestCase):
+    """Unit tests for EasybankGiroCsvParser.extract_transaction."""
+
+    def setUp(self):
+        self.parser = EasybankGiroCsvParser(None)
+
+    def test_without_transaction_code(self):
+        self.assertEqual(
+            self.parser.extract_transaction("Some   text  "),
+            ('', "Some text", "Some text"))
+
+    def test_banking_information_ends_at_next_code(self):
+        self.assertEqual(
+            self.parser.extract_transaction(
+                "Memo  FE/000000003 AT098765432109876543 Name  "
+                "FE/000000004 Other"),
+            ('3', "Memo", "Name (AT098765432109876543)"))
+
 # vim: tabstop=4 expandtab shiftwidth=4 softtabstop=4 smartindent autoindent
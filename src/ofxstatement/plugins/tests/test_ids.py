@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+# This file is part of ofxstatement-austrian.
+# See README.rst for more information.
+
+import datetime
+from decimal import Decimal
+import io
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+from ofxstatement.statement import generate_transaction_id
+
+from ofxstatement.plugins import ids
+from ofxstatement.plugins.base import StatementRecord
+from ofxstatement.plugins.ids import IdEngine
+from ofxstatement.plugins.ingdiba import IngDiBaCsvParser
+from ofxstatement.plugins.raiffeisen import RaiffeisenPlugin
+from ofxstatement.plugins.tests.test_base import SAMPLES, sample_path
+
+
+class TestIdEngine(unittest.TestCase):
+    """Unit tests for IdEngine."""
+
+    def test_same_ids_as_before(self):
+        engine = IdEngine()
+        for parser_class, sample, encoding in SAMPLES:
+            with self.subTest(parser=parser_class.__name__):
+                with open(sample_path(sample), encoding=encoding) as fin:
+                    stmt = parser_class(fin).parse()
+                for line in stmt.lines:
+                    self.assertEqual(engine.generate(line),
+                                     generate_transaction_id(line))
+
+    def test_missing_fields(self):
+        line = StatementRecord(date=datetime.datetime(2013, 6, 28))
+        self.assertEqual(IdEngine().generate(line),
+                         generate_transaction_id(line))
+
+    def test_date_cache_is_bounded(self):
+        engine = IdEngine()
+        line = StatementRecord(memo='memo', amount=Decimal('1.00'))
+        with mock.patch.object(ids, 'DATE_CACHE_SIZE', 2):
+            for day in range(1, 6):
+                line.date = datetime.datetime(2013, 6, day)
+                self.assertEqual(engine.generate(line),
+                                 generate_transaction_id(line))
+        self.assertLessEqual(len(engine.dates), 2)
+
+    def test_disambiguate(self):
+        engine = IdEngine()
+        self.assertEqual(engine.disambiguate('a'), 'a')
+        self.assertEqual(engine.disambiguate('a'), 'a')
+
+        engine = IdEngine(count_collisions=True)
+        self.assertEqual([engine.disambiguate(x) for x in 'abaa'],
+                         ['a', 'b', 'a-2', 'a-3'])
+        self.assertEqual(engine.collisions, 2)
+
+
+class TestCountCollisions(unittest.TestCase):
+    """Identical transactions get distinct ids with count_collisions."""
+
+    line = ('05.07.2013;"Entgelt Kontoauszug";05.07.2013;-0,11;EUR;'
+            '05.07.2013 00:00:31:010;\n')
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.csvfile = os.path.join(self.tmpdir, 'raiffeisen.csv')
+        with open(self.csvfile, 'w', encoding='cp1252') as fout:
+            fout.write(self.line * 2)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def parse(self, **settings):
+        parser = RaiffeisenPlugin(None, settings).get_parser(self.csvfile)
+        with parser.fin:
+            return parser.parse()
+
+    def test_same_ids_by_default(self):
+        stmt = self.parse()
+        self.assertEqual(stmt.lines[0].id, stmt.lines[1].id)
+
+    def test_numbered_ids(self):
+        stmt = self.parse(count_collisions='yes')
+        first = stmt.lines[0].id
+        self.assertEqual(first, generate_transaction_id(stmt.lines[0]))
+        self.assertEqual(stmt.lines[1].id, first + '-2')
+
+    def test_split_accounts(self):
+        parser = IngDiBaCsvParser(io.StringIO(
+            "Kontonummer;Text;Datum;Währung;Soll;Haben\n"
+            "111;Entgelt;31.12.2013;EUR;1,00;0,00\n"
+            "222;Entgelt;31.12.2013;EUR;1,00;0,00\n"
+            "222;Entgelt;31.12.2013;EUR;1,00;0,00\n"))
+        parser.ids.count_collisions = True
+        first, second = parser.parse_statements()
+        id = first.lines[0].id
+        self.assertEqual(second.lines[0].id, id)
+        self.assertEqual(second.lines[1].id, id + '-2')
+        self.assertEqual(parser.ids.collisions, 1)
+
+    def test_profile(self):
+        profile = os.path.join(self.tmpdir, 'profile.json')
+        self.parse(count_collisions='yes', profile=profile)
+        with open(profile) as fin:
+            counters = json.load(fin)['counters']
+        self.assertEqual(counters['id_collisions'], 1)
+
+    def test_seen_index(self):
+        seen_index = os.path.join(self.tmpdir, 'seen.sqlite')
+        self.parse(count_collisions='yes', seen_index=seen_index)
+
+        # A later export has a third fee on the same day
+        with open(self.csvfile, 'a', encoding='cp1252') as fout:
+            fout.write(self.line)
+        stmt = self.parse(count_collisions='yes', seen_index=seen_index)
+        self.assertEqual(len(stmt.lines), 1)
+        self.assertTrue(stmt.lines[0].id.endswith('-3'))
+
+# vim: tabstop=4 expandtab shiftwidth=4 softtabstop=4 smartindent autoindent
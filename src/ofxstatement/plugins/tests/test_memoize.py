@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+# This file is part of ofxstatement-austrian.
+# See README.rst for more information.
+
+from decimal import Decimal
+import unittest
+
+from ofxstatement.plugins.raiffeisen import \
+    RaiffeisenCsvParser, RaiffeisenPlugin
+from ofxstatement.plugins.tests.test_base import SAMPLES, sample_path
+
+
+class TestMemoizedAmounts(unittest.TestCase):
+    """Compare the memoized amounts of all parsers to the default mode."""
+
+    def test_identical_output(self):
+        for parser_class, sample, encoding in SAMPLES:
+            with self.subTest(parser=parser_class.__name__):
+                with open(sample_path(sample), encoding=encoding) as fin:
+                    expected = parser_class(fin).parse()
+                with open(sample_path(sample), encoding=encoding) as fin:
+                    parser = parser_class(fin)
+                    parser.memoize_amounts = True
+                    parser.table_size = 2
+                    stmt = parser.parse()
+
+                self.assertEqual(
+                    [(x.id, x.date, x.amount, x.memo, x.trntype)
+                     for x in stmt.lines],
+                    [(x.id, x.date, x.amount, x.memo, x.trntype)
+                     for x in expected.lines])
+                self.assertEqual(
+                    [str(x.amount) for x in stmt.lines],
+                    [str(x.amount) for x in expected.lines])
+                self.assertEqual(stmt.end_balance, expected.end_balance)
+
+    def test_table(self):
+        with open(sample_path('raiffeisen.csv'), encoding='cp1252') as fin:
+            parser = RaiffeisenCsvParser(fin)
+            parser.memoize_amounts = True
+            parser.parse()
+        self.assertEqual(len(parser.amount_table), 7)
+        self.assertEqual(parser.amount_table['-6,65'], Decimal('-6.65'))
+
+    def test_invalid_value(self):
+        parser = RaiffeisenCsvParser(
+            ['28.06.2013;"Entgelt";28.06.2013;Betrag;EUR;'])
+        parser.memoize_amounts = True
+        self.assertRaises(ValueError, parser.parse)
+        self.assertEqual(parser.amount_table, {})
+
+    def test_plugin_setting(self):
+        plugin = RaiffeisenPlugin(None, {'memoize_amounts': 'yes'})
+        parser = plugin.get_parser(sample_path('raiffeisen.csv'))
+        with parser.fin:
+            self.assertTrue(parser.memoize_amounts)
+            self.assertEqual(len(parser.parse().lines), 7)
+
+# vim: tabstop=4 expandtab shiftwidth=4 softtabstop=4 smartindent autoindent
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+# This file is part of ofxstatement-austrian.
+# See README.rst for more information.
+
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+from ofxstatement.plugins import parallel
+from ofxstatement.plugins.auto import PLUGINS
+from ofxstatement.plugins.parallel import split_chunks
+from ofxstatement.plugins.tests.test_base import sample_path
+
+SAMPLES = [
+    ('easybank', 'easybank-creditcard.csv'),
+    ('easybank', 'easybank-giro.csv'),
+    ('ing-diba', 'ing-diba.csv'),
+    ('livebank', 'livebank.csv'),
+    ('oberbank', 'oberbank.csv'),
+    ('raiffeisen', 'raiffeisen.csv'),
+]
+
+
+class TestParallel(unittest.TestCase):
+    """Parsing in chunks gives the same statement as a sequential run."""
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def write(self, name, sample, copies=20):
+        """Write an export with the records of a sample repeated."""
+        with open(sample_path(sample), 'rb') as fin:
+            lines = fin.readlines()
+        if PLUGINS[name].header:
+            lines = lines[:1] + lines[1:] * copies
+        else:
+            lines = lines * copies
+
+        filename = os.path.join(self.tmpdir, sample)
+        with open(filename, 'wb') as fout:
+            fout.writelines(lines)
+        return filename
+
+    def parse(self, name, filename, settings):
+        parser = PLUGINS[name](None, settings).get_parser(filename)
+        with parser.fin:
+            return parser.parse()
+
+    def test_split_chunks(self):
+        filename = self.write('raiffeisen', 'raiffeisen.csv', copies=3)
+        chunks = split_chunks(filename, 300)
+        self.assertGreater(len(chunks), 1)
+        self.assertEqual(chunks[0][0], 0)
+        self.assertEqual(chunks[-1][1], os.path.getsize(filename))
+        for previous, chunk in zip(chunks, chunks[1:]):
+            self.assertEqual(previous[1], chunk[0])
+        with open(filename, 'rb') as fin:
+            data = fin.read()
+        for start, end, records in chunks:
+            self.assertEqual(data[:start].count(b'\n'), records)
+            self.assertTrue(data[start:end].endswith(b'\n'))
+
+    def test_same_statement(self):
+        for name, sample in SAMPLES:
+            with self.subTest(sample=sample):
+                filename = self.write(name, sample)
+                expected = self.parse(name, filename, {})
+                with mock.patch.object(parallel, 'CHUNK_SIZE', 512):
+                    stmt = self.parse(name, filename, {'workers': '2'})
+
+                self.assertGreater(len(split_chunks(filename, 512)), 2)
+                self.assertEqual(
+                    [(x.id, x.date, x.amount, x.memo, x.payee)
+                     for x in stmt.lines],
+                    [(x.id, x.date, x.amount, x.memo, x.payee)
+                     for x in expected.lines])
+                self.assertEqual(stmt.end_balance, expected.end_balance)
+                self.assertEqual(stmt.start_date, expected.start_date)
+                self.assertEqual(stmt.end_date, expected.end_date)
+                self.assertEqual(stmt.account_id, expected.account_id)
+                self.assertEqual(stmt.currency, expected.currency)
+
+    def test_empty_file(self):
+        filename = os.path.join(self.tmpdir, 'empty.csv')
+        open(filename, 'w').close()
+        stmt = self.parse('raiffeisen', filename, {'workers': '2'})
+        self.assertEqual(stmt.lines, [])
+
+# vim: tabstop=4 expandtab shiftwidth=4 softtabstop=4 smartindent autoindent
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+# This file is part of ofxstatement-austrian.
+# See README.rst for more information.
+
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+from ofxstatement.plugins.easybank import EasybankPlugin
+from ofxstatement.plugins.livebank import LivebankPlugin
+from ofxstatement.plugins.payees import PayeeRules, literals
+from ofxstatement.plugins.tests.test_base import sample_path
+
+RULES = """\
+[payees]
+Amazon = amazon|amzn
+Payment Receiver =
+    ^payment receiver
+    (AT)(\\d+) ABCDEF1G235
+Foobar = foobar
+Unused = nothing: at all
+"""
+
+
+class TestPayeeRules(unittest.TestCase):
+    """Unit tests for PayeeRules."""
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.filename = os.path.join(self.tmpdir, 'payees.ini')
+        with open(self.filename, 'w', encoding='utf8') as fout:
+            fout.write(RULES)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def test_normalize(self):
+        rules = PayeeRules.load(self.filename)
+        self.assertEqual(rules.normalize('AMAZON *Mktplce'), 'Amazon')
+        self.assertEqual(rules.normalize('Payment receiver (AT0987)'),
+                         'Payment Receiver')
+        self.assertEqual(rules.normalize('Foobar AG (AT098765 ABCDEF1G235)'),
+                         'Payment Receiver')
+        self.assertEqual(rules.normalize('Somebody'), 'Somebody')
+        self.assertIsNone(rules.normalize(None))
+
+    def test_first_rule_wins(self):
+        rules = PayeeRules([('Later', ['b']), ('Earlier', ['a'])])
+        self.assertEqual(rules.normalize('a b'), 'Later')
+
+    def test_cache_and_hits(self):
+        rules = PayeeRules.load(self.filename)
+        for payee in ['amzn', 'amzn', 'Somebody', 'foobar', 'Somebody']:
+            rules.normalize(payee)
+        self.assertEqual(rules.cache, {'amzn': 'Amazon', 'Somebody': None,
+                                       'foobar': 'Foobar'})
+        self.assertEqual(rules.report(), [
+            ('Amazon', 2), ('Payment Receiver', 0), ('Foobar', 1),
+            ('Unused', 0)])
+
+        rules.cache_size = 3
+        rules.normalize('amazon')
+        self.assertEqual(rules.cache, {'amazon': 'Amazon'})
+
+    def test_invalid_rules(self):
+        self.assertRaises(ValueError, PayeeRules, [('Broken', ['(a'])])
+        with open(self.filename, 'w', encoding='utf8') as fout:
+            fout.write("[other]\nAmazon = amazon\n")
+        self.assertRaises(ValueError, PayeeRules.load, self.filename)
+
+    def test_literals(self):
+        self.assertEqual(literals('Stadtwerke\\s+Wien'), ['stadtwerke'])
+        self.assertEqual(literals('^spar\\b'), ['spar'])
+        self.assertEqual(literals('amazon|AMZN'), ['amazon', 'amzn'])
+        self.assertEqual(literals('billa?'), ['bill'])
+        self.assertIsNone(literals('(?i)billa'))
+        self.assertIsNone(literals('ab|billa'))
+        self.assertIsNone(literals('billa|(hofer)'))
+
+    def test_unindexed_rules(self):
+        rules = PayeeRules([('Short', ['ab']), ('Long', ['abcd']),
+                            ('Digits', ['\\d{5}'])])
+        self.assertEqual(rules.unindexed, [0, 2])
+        self.assertEqual(rules.normalize('xabcd'), 'Short')
+        self.assertEqual(rules.normalize('12345'), 'Digits')
+
+    def test_no_rules(self):
+        rules = PayeeRules([])
+        self.assertEqual(rules.normalize('amazon'), 'amazon')
+
+
+class TestNormalizePayees(unittest.TestCase):
+    """Payees are normalized with the payees setting."""
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.settings = {'payees': os.path.join(self.tmpdir, 'payees.ini')}
+        with open(self.settings['payees'], 'w', encoding='utf8') as fout:
+            fout.write(RULES + "Reference = REF:\n")
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def parse(self, plugin_class, sample):
+        parser = plugin_class(None, self.settings).get_parser(
+            sample_path(sample))
+        with parser.fin:
+            return parser.parse()
+
+    def test_easybank_giro(self):
+        stmt = self.parse(EasybankPlugin, 'easybank-giro.csv')
+        self.assertEqual([x.payee for x in stmt.lines[2:7]], [
+            'Payment Receiver', 'Amazon', 'Payment Receiver',
+            'AUTOMAT 01234567 K1 27.07.UM 18.57', 'Payment Receiver'])
+
+    def test_livebank(self):
+        stmt = self.parse(LivebankPlugin, 'livebank.csv')
+        self.assertEqual([x.payee for x in stmt.lines], [
+            'Reference', 'A text, A reference, A text', 'Reference'])
+
+    def test_profile(self):
+        self.settings['profile'] = os.path.join(self.tmpdir, 'profile.json')
+        self.parse(EasybankPlugin, 'easybank-giro.csv')
+        with open(self.settings['profile']) as fin:
+            counters = json.load(fin)['counters']
+        self.assertEqual(counters['payee_rule:Payment Receiver'], 4)
+        self.assertEqual(counters['payee_rule:Amazon'], 1)
+        self.assertEqual(counters['payee_rule:Unused'], 0)
+
+# vim: tabstop=4 expandtab shiftwidth=4 softtabstop=4 smartindent autoindent
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+# This file is part of ofxstatement-austrian.
+# See README.rst for more information.
+
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+from ofxstatement.plugins.easybank import EasybankGiroCsvParser
+from ofxstatement.plugins.livebank import LivebankCsvParser
+from ofxstatement.plugins.oberbank import OberbankPlugin
+from ofxstatement.plugins.profiling import Profile
+from ofxstatement.plugins.tests.test_base import SAMPLES, sample_path
+
+
+class TestProfile(unittest.TestCase):
+    """Unit tests for Profile."""
+
+    def test_stage(self):
+        profile = Profile()
+        with profile.stage('a'):
+            pass
+        with profile.stage('a'):
+            pass
+        self.assertEqual(list(profile.timings), ['a'])
+        self.assertGreater(profile.timings['a'], 0)
+
+    def test_timed(self):
+        profile = Profile()
+        self.assertEqual(list(profile.timed([1, 2], 'items')), [1, 2])
+        self.assertIn('items', profile.timings)
+
+    def test_to_json(self):
+        profile = Profile()
+        profile.count('rows')
+        profile.count('rows', 2)
+        data = json.loads(profile.to_json())
+        self.assertEqual(data, {'timings': {}, 'counters': {'rows': 3}})
+
+
+class TestParserProfiling(unittest.TestCase):
+    """The parsers record timings and counters if profiling."""
+
+    def parse(self, parser_class, sample, encoding):
+        with open(sample_path(sample), encoding=encoding) as fin:
+            parser = parser_class(fin)
+            parser.profile = Profile()
+            stmt = parser.parse()
+        return stmt, parser.profile
+
+    def test_all_parsers(self):
+        for parser_class, sample, encoding in SAMPLES:
+            with self.subTest(parser=parser_class.__name__):
+                stmt, profile = self.parse(parser_class, sample, encoding)
+                counters = profile.counters
+                self.assertEqual(counters['lines'], len(stmt.lines))
+                self.assertEqual(counters['rows_read'],
+                                 len(stmt.lines) + counters['rows_skipped'])
+                for stage in ('total', 'split_records', 'parse_record',
+                              'update_totals'):
+                    self.assertIn(stage, profile.timings)
+
+    def test_livebank_counters(self):
+        _, profile = self.parse(LivebankCsvParser, 'livebank.csv',
+                                'iso-8859-1')
+        self.assertEqual(profile.counters['header_rows'], 1)
+        self.assertEqual(profile.counters['zero_amount_rows'], 3)
+        self.assertEqual(profile.counters['rows_skipped'], 4)
+        self.assertIn('transaction_id', profile.timings)
+
+    def test_easybank_counters(self):
+        _, profile = self.parse(EasybankGiroCsvParser, 'easybank-giro.csv',
+                                'cp1252')
+        self.assertGreater(profile.counters['payee_legacy_fallback'], 0)
+
+    def test_off_by_default(self):
+        with open(sample_path('raiffeisen.csv'), encoding='cp1252') as fin:
+            parser = SAMPLES[-1][0](fin)
+            parser.parse()
+        self.assertIsNone(parser.profile)
+
+
+class TestProfileSetting(unittest.TestCase):
+    """The profile setting writes the profile as JSON."""
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def test_profile_file(self):
+        filename = os.path.join(self.tmpdir, 'profile.json')
+        plugin = OberbankPlugin(None, {'profile': filename})
+        parser = plugin.get_parser(sample_path('oberbank.csv'))
+        with parser.fin:
+            parser.parse()
+
+        with open(filename) as fin:
+            data = json.load(fin)
+        self.assertEqual(data['counters']['header_rows'], 1)
+        self.assertEqual(data['counters']['lines'], 5)
+
+# vim: tabstop=4 expandtab shiftwidth=4 softtabstop=4 smartindent autoindent
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+# This file is part of ofxstatement-austrian.
+# See README.rst for more information.
+
+import csv
+import os
+import shutil
+import tempfile
+import unittest
+
+from ofxstatement.plugins.raiffeisen import RaiffeisenPlugin
+from ofxstatement.plugins.reader import iter_blocks, mmap_records
+from ofxstatement.plugins.tests.test_base import SAMPLES, sample_path
+
+
+class TestIterBlocks(unittest.TestCase):
+    """Unit tests for iter_blocks."""
+
+    def test_whole_lines(self):
+        self.assertEqual(list(iter_blocks(b'ab\ncd\nef', 1)),
+                         [b'ab\n', b'cd\n', b'ef'])
+
+    def test_quoted_line_break(self):
+        self.assertEqual(list(iter_blocks(b'"a\nb"\nc\n', 1)),
+                         [b'"a\nb"\n', b'c\n'])
+
+
+class TestMmapRecords(unittest.TestCase):
+    """The memory-mapped reader splits records like csv.reader."""
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def records(self, data, encoding='cp1252', block_size=4):
+        filename = os.path.join(self.tmpdir, 'export.csv')
+        with open(filename, 'wb') as fout:
+            fout.write(data)
+        with open(filename, encoding=encoding) as fin:
+            return list(mmap_records(fin, block_size))
+
+    def test_samples(self):
+        for _, sample, encoding in SAMPLES:
+            with self.subTest(sample=sample):
+                with open(sample_path(sample), encoding=encoding) as fin:
+                    expected = list(csv.reader(fin, delimiter=';'))
+                    self.assertEqual(list(mmap_records(fin)), expected)
+
+    def test_blocks(self):
+        self.assertEqual(self.records(b'a;b\r\n\r\n"c;d";e\r\nf;g'),
+                         [['a', 'b'], [], ['c;d', 'e'], ['f', 'g']])
+
+    def test_line_break_in_quoted_field(self):
+        self.assertEqual(self.records(b'a;"b\r\nc";d\r\n\r\ne'),
+                         [['a', 'b\nc', 'd'], [], ['e']])
+
+    def test_decoding(self):
+        self.assertEqual(self.records(b'W\xe4hrung;\x80'),
+                         [['W\xe4hrung', '\u20ac']])
+
+    def test_empty_file(self):
+        self.assertEqual(self.records(b''), [])
+
+
+class TestMmapSetting(unittest.TestCase):
+    """Parsing with mmap = yes gives the same statement."""
+
+    def test_same_statement(self):
+        for parser_class, sample, encoding in SAMPLES:
+            with self.subTest(parser=parser_class.__name__):
+                with open(sample_path(sample), encoding=encoding) as fin:
+                    expected = parser_class(fin).parse()
+                with open(sample_path(sample), encoding=encoding) as fin:
+                    parser = parser_class(fin)
+                    parser.mmap = True
+                    stmt = parser.parse()
+
+                self.assertEqual(
+                    [(x.id, x.date, x.amount, x.memo, x.payee, x.check_no)
+                     for x in stmt.lines],
+                    [(x.id, x.date, x.amount, x.memo, x.payee, x.check_no)
+                     for x in expected.lines])
+                self.assertEqual(stmt.end_balance, expected.end_balance)
+                self.assertEqual(stmt.account_id, expected.account_id)
+                self.assertEqual(stmt.currency, expected.currency)
+
+    def test_plugin_setting(self):
+        plugin = RaiffeisenPlugin(None, {'mmap': 'yes'})
+        parser = plugin.get_parser(sample_path('raiffeisen.csv'))
+        with parser.fin:
+            self.assertTrue(parser.mmap)
+            self.assertEqual(len(parser.parse().lines), 7)
+
+# vim: tabstop=4 expandtab shiftwidth=4 softtabstop=4 smartindent autoindent
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+# This file is part of ofxstatement-austrian.
+# See README.rst for more information.
+
+from decimal import Decimal
+import os
+import shutil
+import tempfile
+import unittest
+
+from ofxstatement.plugins.raiffeisen import RaiffeisenPlugin
+from ofxstatement.plugins.seen import SeenIndex
+from ofxstatement.plugins.tests.test_base import sample_path
+
+
+class TestSeenIndex(unittest.TestCase):
+    """Unit tests for SeenIndex."""
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.filename = os.path.join(self.tmpdir, 'seen.sqlite')
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def test_seen_after_commit(self):
+        index = SeenIndex(self.filename)
+        index.add('account', 'id')
+        self.assertFalse(index.seen('account', 'id'))
+        index.commit()
+        self.assertTrue(index.seen('account', 'id'))
+        self.assertFalse(index.seen('other', 'id'))
+        index.close()
+
+        index = SeenIndex(self.filename)
+        self.assertTrue(index.seen('account', 'id'))
+        index.close()
+
+
+class TestIncrementalImport(unittest.TestCase):
+    """Only new transactions are imported with a seen index."""
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.csvfile = os.path.join(self.tmpdir, 'raiffeisen.csv')
+        shutil.copy(sample_path('raiffeisen.csv'), self.csvfile)
+        self.plugin = RaiffeisenPlugin(None, {
+            'seen_index': os.path.join(self.tmpdir, 'seen.sqlite')})
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def parse(self):
+        parser = self.plugin.get_parser(self.csvfile)
+        with parser.fin:
+            return parser.parse()
+
+    def append(self, line):
+        with open(self.csvfile, 'a', encoding='cp1252') as fout:
+            fout.write(line)
+
+    def test_second_import_is_empty(self):
+        self.assertEqual(len(self.parse().lines), 7)
+
+        stmt = self.parse()
+        self.assertEqual(stmt.lines, [])
+        self.assertEqual(stmt.end_balance, Decimal(0))
+        self.assertIsNone(stmt.start_date)
+
+    def test_only_new_transactions(self):
+        self.parse()
+        self.append('05.07.2013;"Entgelt Kontoauszug";05.07.2013;-0,11;EUR;'
+                    '05.07.2013 00:00:31:010;\n')
+
+        stmt = self.parse()
+        self.assertEqual(len(stmt.lines), 1)
+        self.assertEqual(stmt.lines[0].amount, Decimal('-0.11'))
+        self.assertEqual(stmt.end_balance, Decimal('-0.11'))
+
+    def test_identical_transactions_in_one_export(self):
+        line = ('05.07.2013;"Entgelt Kontoauszug";05.07.2013;-0,11;EUR;'
+                '05.07.2013 00:00:31:010;\n')
+        self.append(line + line)
+        self.assertEqual(len(self.parse().lines), 9)
+
+# vim: tabstop=4 expandtab shiftwidth=4 softtabstop=4 smartindent autoindent
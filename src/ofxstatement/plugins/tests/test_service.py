@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+# This file is part of ofxstatement-austrian.
+# See README.rst for more information.
+
+import asyncio
+import json
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+
+from ofxstatement.plugins import service as service_module
+from ofxstatement.plugins.service import ImportService
+from ofxstatement.plugins.tests.test_base import sample_path
+
+SAMPLES = ['easybank-giro.csv', 'ing-diba.csv', 'livebank.csv',
+           'oberbank.csv', 'raiffeisen.csv']
+
+# An ING-DiBa export of two accounts, one of them in two currencies
+COMBINED = """\
+Kontonummer;Text;Datum;Währung;Soll;Haben
+111;Habenzinsen;31.12.2013;EUR;0,00;12,23
+222;Miete;02.01.2014;EUR;500,00;0,00
+222;Card;03.01.2014;USD;10,00;0,00
+"""
+
+
+class TestImportService(unittest.TestCase):
+    """Unit tests for the drop directory service."""
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.drop = os.path.join(self.tmpdir, 'drop')
+        self.output = os.path.join(self.tmpdir, 'ofx')
+        os.mkdir(self.drop)
+        os.mkdir(self.output)
+        self.loop = asyncio.new_event_loop()
+
+    def tearDown(self):
+        self.loop.close()
+        shutil.rmtree(self.tmpdir)
+
+    def drop_samples(self):
+        for sample in SAMPLES:
+            shutil.copy(sample_path(sample), self.drop)
+
+    def service(self, **kwargs):
+        kwargs.setdefault('workers', 2)
+        return ImportService(self.drop, self.output, interval=0.01,
+                             **kwargs)
+
+    def run_until(self, service, files, *coroutines):
+        async def stop():
+            while service.converted + service.failed < files:
+                await asyncio.sleep(0.01)
+            service.stop()
+
+        async def main():
+            with ThreadPoolExecutor(2) as executor:
+                await asyncio.gather(service.run(executor), stop(),
+                                     *coroutines)
+
+        self.loop.run_until_complete(asyncio.wait_for(main(), 30))
+
+    def test_convert_dropped_files(self):
+        self.drop_samples()
+        stats_file = os.path.join(self.tmpdir, 'stats.json')
+        service = self.service(stats_file=stats_file)
+        self.run_until(service, len(SAMPLES))
+
+        self.assertEqual(sorted(os.listdir(self.output)), sorted(
+            ['.outputs.json'] +
+            [os.path.splitext(x)[0] + '.ofx' for x in SAMPLES]))
+        with open(stats_file) as fin:
+            stats = json.load(fin)
+        self.assertEqual(stats['converted'], len(SAMPLES))
+        self.assertEqual(stats['failed'], 0)
+        self.assertEqual(stats['queue_depth'], 0)
+        self.assertGreater(stats['latency_max'], 0)
+
+    def test_wait_until_file_is_stable(self):
+        self.drop_samples()
+        service = self.service()
+        self.assertEqual(service.scan(), [])
+        self.assertEqual(len(service.scan()), len(SAMPLES))
+        self.assertEqual(service.scan(), [])
+
+        with open(os.path.join(self.drop, 'raiffeisen.csv'), 'a') as fout:
+            fout.write('\n')
+        self.assertEqual(service.scan(), [])
+        self.assertEqual(service.scan(),
+                         [os.path.join(self.drop, 'raiffeisen.csv')])
+
+    def test_skip_converted_files(self):
+        self.drop_samples()
+        self.run_until(self.service(), len(SAMPLES))
+
+        service = self.service()
+        self.assertEqual(service.scan(), [])
+        self.assertEqual(service.scan(), [])
+
+    def test_rewritten_while_converting(self):
+        filename = os.path.join(self.drop, 'raiffeisen.csv')
+        shutil.copy(sample_path('raiffeisen.csv'), filename)
+        service = self.service(workers=1)
+        release = threading.Event()
+        convert_file = service_module.convert_file
+
+        def slow_convert_file(*args):
+            release.wait(10)
+            return convert_file(*args)
+
+        async def rewrite():
+            while not service.converting:
+                await asyncio.sleep(0.01)
+            with open(filename, 'a') as fout:
+                fout.write('\n')
+            while not service.queue.qsize():
+                await asyncio.sleep(0.01)
+            release.set()
+            # A file dropped later is still converted
+            shutil.copy(sample_path('oberbank.csv'), self.drop)
+
+        with mock.patch.object(service_module, 'convert_file',
+                               slow_convert_file):
+            self.run_until(service, 3, rewrite())
+        self.assertEqual((service.converted, service.failed), (3, 0))
+        self.assertEqual(len(service.latencies), 3)
+        self.assertEqual(sorted(service.outputs), [
+            os.path.join(self.drop, 'oberbank.csv'), filename])
+
+    def test_conversion_raises(self):
+        self.drop_samples()
+        service = self.service(workers=1)
+        convert_file = service_module.convert_file
+
+        def broken_convert_file(filename, *args):
+            if filename.endswith('ing-diba.csv'):
+                raise RuntimeError('worker died')
+            return convert_file(filename, *args)
+
+        with mock.patch.object(service_module, 'convert_file',
+                               broken_convert_file):
+            self.run_until(service, len(SAMPLES))
+        self.assertEqual(service.failed, 1)
+        self.assertEqual(service.converted, len(SAMPLES) - 1)
+        self.assertNotIn(os.path.join(self.drop, 'ing-diba.csv'),
+                         service.outputs)
+
+    def test_split_files_are_up_to_date(self):
+        filename = os.path.join(self.drop, 'combined.csv')
+        with open(filename, 'w', encoding='iso-8859-1') as fout:
+            fout.write(COMBINED)
+        self.run_until(self.service(settings={'split_accounts': 'yes'}), 1)
+        self.assertEqual(sorted(os.listdir(self.output)), [
+            '.outputs.json', 'combined-111.ofx', 'combined-222-EUR.ofx',
+            'combined-222-USD.ofx'])
+
+        service = self.service()
+        mtime = os.stat(filename).st_mtime
+        self.assertTrue(service.is_up_to_date(filename, mtime))
+        os.unlink(os.path.join(self.output, 'combined-111.ofx'))
+        self.assertTrue(service.is_up_to_date(filename, mtime))
+        self.assertFalse(service.is_up_to_date(filename, mtime + 10))
+
+    def test_outputs_of_other_files(self):
+        filename = os.path.join(self.drop, '2020.csv')
+        shutil.copy(sample_path('ing-diba.csv'), filename)
+        mtime = os.stat(filename).st_mtime
+        with open(os.path.join(self.output, '2020-01.ofx'), 'w'):
+            pass
+        self.assertFalse(self.service().is_up_to_date(filename, mtime - 1))
+
+# vim: tabstop=4 expandtab shiftwidth=4 softtabstop=4 smartindent autoindent
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+# This file is part of ofxstatement-austrian.
+# See README.rst for more information.
+
+from datetime import datetime
+from decimal import Decimal
+import io
+import unittest
+
+from ofxstatement.statement import StatementLine
+
+from ofxstatement.plugins.base import AustrianCsvParser
+from ofxstatement.plugins.profiling import Profile
+from ofxstatement.plugins.spec import FormatSpec
+
+SAMPLE = """\
+Datum;Text;Betrag;Währung;Empfänger;Ort
+01.02.2020;Miete  Februar;-500,00;EUR;Hausverwaltung;Wien
+03.02.2020;Gehalt;1.234,56;EUR;Firma;Linz
+04.02.2020;Storno;0,00;EUR;Firma;Linz
+"""
+
+
+class ExampleCsvParser(AustrianCsvParser):
+    """A bank described by a spec only."""
+
+    spec = FormatSpec(
+        header_rows=1,
+        date=0,
+        memo=1,
+        amount=2,
+        currency=3,
+        payee=slice(4, None),
+        skip_zero=True,
+        clean=('memo',),
+        )
+
+
+class TestFormatSpec(unittest.TestCase):
+    """Unit tests for FormatSpec."""
+
+    def parse(self, parser_class, data, **attributes):
+        parser = parser_class(io.StringIO(data))
+        for name, value in attributes.items():
+            setattr(parser, name, value)
+        return parser, parser.parse()
+
+    def test_new_bank(self):
+        parser, stmt = self.parse(ExampleCsvParser, SAMPLE)
+        self.assertEqual(stmt.currency, 'EUR')
+        self.assertEqual(len(stmt.lines), 2)
+
+        line = stmt.lines[1]
+        self.assertEqual(line.date, datetime(2020, 2, 3))
+        self.assertEqual(line.amount, Decimal('1234.56'))
+        self.assertEqual(line.memo, 'Gehalt')
+        self.assertEqual(line.payee, 'Firma, Linz')
+        self.assertEqual(line.trntype, 'CREDIT')
+        self.assertEqual(line.id, parser.ids.generate(line))
+        self.assertEqual(stmt.lines[0].memo, 'Miete Februar')
+        self.assertEqual(stmt.lines[0].trntype, 'DEBIT')
+        self.assertEqual(stmt.end_balance, Decimal('734.56'))
+
+    def test_memoize_amounts(self):
+        _, expected = self.parse(ExampleCsvParser, SAMPLE)
+        _, stmt = self.parse(ExampleCsvParser, SAMPLE,
+                             memoize_amounts=True)
+        self.assertEqual([repr(x) for x in stmt.lines],
+                         [repr(x) for x in expected.lines])
+
+    def test_counters(self):
+        parser, _ = self.parse(ExampleCsvParser, SAMPLE, profile=Profile())
+        self.assertEqual(parser.profile.counters['header_rows'], 1)
+        self.assertEqual(parser.profile.counters['zero_amount_rows'], 1)
+
+    def test_credit_column(self):
+        class Parser(AustrianCsvParser):
+            spec = FormatSpec(date=0, amount=1, credit=2)
+
+        _, stmt = self.parse(Parser, "01.02.2020;0,00;5,00\n"
+                                     "02.02.2020;2,50;0,00\n")
+        self.assertEqual([x.amount for x in stmt.lines],
+                         [Decimal('5.00'), Decimal('-2.50')])
+
+    def test_extract(self):
+        class Parser(AustrianCsvParser):
+            spec = FormatSpec(date=0, amount=1, memo=2, extract='split',
+                              extracts=('memo', 'id'))
+
+            def split(self, description):
+                return description.split('|')
+
+        _, stmt = self.parse(Parser, "01.02.2020;1,00;Kauf|42\n")
+        self.assertEqual(stmt.lines[0].memo, 'Kauf')
+        self.assertEqual(stmt.lines[0].id, '42')
+
+    def test_record_class(self):
+        class Record(StatementLine):
+            def __init__(self, **fields):
+                super(Record, self).__init__()
+                self.__dict__.update(fields)
+
+        _, stmt = self.parse(ExampleCsvParser, SAMPLE, record_class=Record)
+        self.assertIsInstance(stmt.lines[1], Record)
+        self.assertEqual(stmt.lines[1].payee, 'Firma, Linz')
+        self.assertEqual(stmt.lines[1].trntype, 'CREDIT')
+
+    def test_missing_column(self):
+        with self.assertRaises(ValueError):
+            self.parse(ExampleCsvParser, SAMPLE + "05.02.2020;Text;1,00\n")
+
+    def test_compiled_once(self):
+        spec = ExampleCsvParser.spec
+        self.assertIs(spec.compile(), spec.compile())
+        self.assertIsNot(spec.compile(), spec.compile(memoize_amounts=True))
+        self.assertIn("r[4:]", spec.source())
+
+    def test_layout(self):
+        spec = FormatSpec(date=2, amount=4, credit=5, memo=1)
+        self.assertEqual(spec.date_column, 2)
+        self.assertEqual(spec.columns, 6)
+        self.assertRaises(ValueError, FormatSpec, date=0, amount=1,
+                          amount_style='swiss')
+        self.assertRaises(ValueError, FormatSpec, date=0, amount=1,
+                          extracts=('memo',))
+
+# vim: tabstop=4 expandtab shiftwidth=4 softtabstop=4 smartindent autoindent
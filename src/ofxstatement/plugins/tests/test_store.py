@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+# This file is part of ofxstatement-austrian.
+# See README.rst for more information.
+
+from datetime import date, datetime
+from decimal import Decimal
+import unittest
+from unittest import mock
+
+from ofxstatement.statement import Statement, StatementLine
+from ofxstatement.plugins.base import StatementRecord
+from ofxstatement.plugins.raiffeisen import RaiffeisenPlugin
+from ofxstatement.plugins import store as store_module
+from ofxstatement.plugins.store import StatementStore
+from ofxstatement.plugins.tests.test_base import SAMPLES, sample_path
+
+FIELDS = StatementRecord.__slots__
+
+
+def fields(stmtline):
+    return [repr(getattr(stmtline, name)) for name in FIELDS]
+
+
+class TestStatementStore(unittest.TestCase):
+    """Unit tests for StatementStore."""
+
+    def setUp(self):
+        parser = RaiffeisenPlugin(None, {}).get_parser(
+            sample_path('raiffeisen.csv'))
+        with parser.fin:
+            self.store = StatementStore.from_parser(parser)
+
+    def test_round_trip(self):
+        for parser_class, sample, encoding in SAMPLES:
+            with self.subTest(parser=parser_class.__name__):
+                with open(sample_path(sample), encoding=encoding) as fin:
+                    stmt = parser_class(fin).parse()
+
+                store = StatementStore.from_statement(stmt)
+                result = store.to_statement()
+                self.assertEqual([fields(x) for x in result.lines],
+                                 [fields(x) for x in stmt.lines])
+                self.assertEqual(result.account_id, stmt.account_id)
+                self.assertEqual(result.end_balance, stmt.end_balance)
+                self.assertEqual(store.total(), stmt.end_balance -
+                                 stmt.start_balance)
+                self.assertEqual(len(store), len(stmt.lines))
+
+    def test_exact_amounts(self):
+        lines = [StatementLine('a', datetime(2020, 1, 1), 'x', Decimal(x))
+                 for x in ('5', '-0.00', '1.50', '-1.5')]
+        lines[0].date_user = datetime(2020, 1, 2)
+        lines[0].payee = 'y'
+        store = StatementStore()
+        store.extend(lines)
+        self.assertEqual(sorted(store.exact), [0, 1, 3])
+        self.assertEqual([fields(x) for x in store.to_lines()],
+                         [fields(x) for x in lines])
+
+    def test_not_stored(self):
+        store = StatementStore()
+        line = StatementLine('a', datetime(2020, 1, 1), 'x', Decimal('1.234'))
+        self.assertRaises(ValueError, store.extend, [line])
+        line.amount = Decimal(1)
+        line.date = datetime(2020, 1, 1, 12)
+        self.assertRaises(ValueError, store.extend, [line])
+        line.date = datetime(2020, 1, 1)
+        line.bank_account_to = 'AT12'
+        self.assertRaises(ValueError, store.extend, [line])
+
+    def test_interned(self):
+        memos = [self.store.to_lines([x])[0].memo
+                 for x in range(len(self.store))]
+        self.assertEqual(len(self.store.strings),
+                         len(set(memos) | {None, 'CREDIT', 'DEBIT'}))
+
+    def test_between(self):
+        store = self.store
+        rows = store.between(date(2013, 6, 28), date(2013, 7, 2))
+        self.assertEqual([x.date for x in store.to_lines(rows)],
+                         [datetime(2013, 6, 28)] * 4 +
+                         [datetime(2013, 7, 1)] * 2)
+        self.assertEqual(store.between(date(2014, 1, 1)), [])
+        self.assertEqual(len(store.between()), 7)
+
+    def test_select(self):
+        store = self.store
+        rows = store.select(sign=1)
+        self.assertTrue(all(x.amount > 0 for x in store.to_lines(rows)))
+        self.assertEqual(len(rows) + len(store.select(sign=-1)), 7)
+
+        rows = store.select(memo='ENTGELT')
+        self.assertEqual([x.memo for x in store.to_lines(rows)],
+                         ['Entgelt Kontoauszug', 'Entgelt Kontoführung'])
+        self.assertEqual(store.select(end=date(2013, 6, 27),
+                                      memo='entgelt'), [])
+
+    def test_monthly_totals(self):
+        totals = self.store.monthly_totals()
+        self.assertEqual(list(totals), [(2013, 6), (2013, 7)])
+        self.assertEqual(totals[2013, 7], {'CREDIT': Decimal('123.60'),
+                                           'DEBIT': Decimal('-275.16')})
+        self.assertEqual(sum(sum(x.values()) for x in totals.values()),
+                         self.store.total())
+
+    def test_monthly_totals_without_numpy(self):
+        rows = self.store.select(memo='entgelt')
+        expected = self.store.monthly_totals(rows)
+        with mock.patch.object(store_module, 'get_numpy', lambda: None):
+            self.assertEqual(self.store.monthly_totals(rows), expected)
+            self.assertEqual(self.store.monthly_totals([]), {})
+        self.assertEqual(self.store.monthly_totals([]), {})
+        self.assertEqual(expected, {(2013, 6): {'DEBIT': Decimal('-6.76')}})
+
+    def test_extend_reindexes(self):
+        store = StatementStore(Statement())
+        store.extend([StatementRecord('a', datetime(2020, 1, 2), 'x',
+                                      Decimal('1.00'))])
+        self.assertEqual(store.between(), [0])
+        store.extend([StatementRecord('b', datetime(2020, 1, 1), 'x',
+                                      Decimal('2.00'))])
+        self.assertEqual(store.between(), [1, 0])
+
+# vim: tabstop=4 expandtab shiftwidth=4 softtabstop=4 smartindent autoindent
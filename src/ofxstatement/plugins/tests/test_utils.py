@@ -2,10 +2,13 @@
 # This file is part of ofxstatement-austrian.
 # See README.rst for more information.
 
+import datetime
+from decimal import Decimal
 import unittest
 
 from ofxstatement.plugins.utils import \
-    clean_multiple_whitespaces, fix_amount_string
+    clean_multiple_whitespaces, fix_amount_string, parse_austrian_amount, \
+    parse_date
 
 
 class TestCleanMultipleWhiteSpaces(unittest.TestCase):
@@ -43,4 +46,61 @@ class TestFixAmountString(unittest.TestCase):
     def test_with_thousand_mark(self):
         self.assertEqual(fix_amount_string("100.234,23"), "100234.23")
 
+
+class TestParseAustrianAmount(unittest.TestCase):
+    """Unit tests for parse_austrian_amount helper."""
+
+    def test_valid(self):
+        for value, expected in (("+1.234,56", "1234.56"),
+                                ("-0,42", "-0.42"),
+                                ("34,56", "34.56"),
+                                ("1234,5", "1234.5"),
+                                ("12.345.678,00", "12345678.00"),
+                                ("11", "11")):
+            with self.subTest(value=value):
+                amount = parse_austrian_amount(value)
+                self.assertEqual(str(amount), expected)
+                self.assertIsInstance(amount, Decimal)
+
+    def test_invalid(self):
+        for value in ("", "-", ",5", "1,", "1,2,3", "1.2,00", "12.34",
+                      "1.234.5,00", " 1,00", "1,00 ", "1e5", "NaN", "1_000",
+                      "--1", "1-", "Betrag", "\u0663,00"):
+            with self.subTest(value=value):
+                with self.assertRaisesRegex(ValueError, "Invalid amount"):
+                    parse_austrian_amount(value)
+
+
+class TestParseDate(unittest.TestCase):
+    """Unit tests for parse_date helper."""
+
+    def setUp(self):
+        parse_date.cache_clear()
+
+    def test_austrian_layout(self):
+        self.assertEqual(parse_date("31.12.2013", "%d.%m.%Y"),
+                         datetime.datetime(2013, 12, 31))
+
+    def test_iso_layout(self):
+        self.assertEqual(parse_date("2013-07-03", "%Y-%m-%d"),
+                         datetime.datetime(2013, 7, 3))
+
+    def test_other_layouts_use_strptime(self):
+        self.assertEqual(parse_date("1.7.2013", "%d.%m.%Y"),
+                         datetime.datetime(2013, 7, 1))
+        self.assertEqual(parse_date("03/07/2013", "%d/%m/%Y"),
+                         datetime.datetime(2013, 7, 3))
+
+    def test_invalid_dates(self):
+        for value in ("31.02.2013", "2013-07-03", "Datum", "+1.07.2013"):
+            with self.subTest(value=value):
+                self.assertRaises(ValueError, parse_date, value, "%d.%m.%Y")
+
+    def test_cache_counters(self):
+        for _ in range(3):
+            parse_date("31.12.2013", "%d.%m.%Y")
+        info = parse_date.cache_info()
+        self.assertEqual(info.hits, 2)
+        self.assertEqual(info.misses, 1)
+
 # vim: tabstop=4 expandtab shiftwidth=4 softtabstop=4 smartindent autoindent
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+# This file is part of ofxstatement-austrian.
+# See README.rst for more information.
+
+import csv
+import datetime
+from decimal import Decimal
+import io
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+from ofxstatement.plugins import writers
+from ofxstatement.plugins.batch import convert_files, main
+from ofxstatement.plugins.ingdiba import IngDiBaCsvParser
+from ofxstatement.plugins.tests.test_base import \
+    SAMPLES, TestParseStatements, sample_path
+
+
+class TestWriters(unittest.TestCase):
+    """Unit tests for the tabular output formats."""
+
+    def write(self, output_format, data=TestParseStatements.ING,
+              batch_size=2):
+        parser = IngDiBaCsvParser(io.StringIO(data))
+        parser.statement.bank_id = 'ING-DiBa'
+        if output_format == 'parquet':
+            fout = io.BytesIO()
+        else:
+            fout = io.StringIO()
+        rows = writers.write(parser, fout, output_format, batch_size)
+        return rows, fout.getvalue()
+
+    def test_csv(self):
+        rows, data = self.write('csv')
+        records = list(csv.DictReader(io.StringIO(data)))
+        self.assertEqual(rows, 5)
+        self.assertEqual(len(records), 5)
+        self.assertEqual(list(records[0]), list(writers.COLUMNS))
+        self.assertEqual(
+            [(x['account_id'], x['currency'], x['date'], x['amount'])
+             for x in records[3:]],
+            [('222', 'EUR', '2014-01-01', '1000.00'),
+             ('222', 'USD', '2014-01-03', '-10.00')])
+        self.assertEqual(records[0]['payee'], '')
+
+    def test_jsonl(self):
+        rows, data = self.write('jsonl')
+        records = [json.loads(x) for x in data.splitlines()]
+        self.assertEqual(len(records), 5)
+        self.assertEqual(records[1]['memo'], 'Miete')
+        self.assertEqual(records[1]['amount'], '-500.00')
+        self.assertEqual(records[1]['date'], '2014-01-02')
+        self.assertEqual(records[1]['bank_id'], 'ING-DiBa')
+        self.assertIsNone(records[1]['payee'])
+
+    @unittest.skipIf(writers.get_pyarrow() is None,
+                     "pyarrow is not installed")
+    def test_parquet(self):
+        rows, data = self.write('parquet')
+        table = writers.get_pyarrow().parquet.read_table(io.BytesIO(data))
+        self.assertEqual(table.num_rows, 5)
+        records = table.to_pylist()
+        self.assertEqual(records[3]['amount'], Decimal('1000.00'))
+        self.assertEqual(records[3]['date'], datetime.date(2014, 1, 1))
+        self.assertEqual(records[4]['currency'], 'USD')
+
+    @unittest.skipIf(writers.get_pyarrow() is None,
+                     "pyarrow is not installed")
+    def test_parquet_scale(self):
+        data = TestParseStatements.ING + \
+            "111;Zinsen;31.12.2013;EUR;0,00;1,505\n"
+        with self.assertRaisesRegex(ValueError, r"amount 1\.505 to Parquet"):
+            self.write('parquet', data)
+        self.assertRaises(ValueError, writers.check_amounts,
+                          [Decimal('1' * 17)])
+        writers.check_amounts([Decimal('1.5'), Decimal('5'), None,
+                               Decimal('-' + '9' * 16 + '.99')])
+
+    def test_parquet_without_pyarrow(self):
+        with mock.patch.object(writers, 'pyarrow', None):
+            with self.assertRaises(ImportError):
+                self.write('parquet')
+
+    def test_same_lines_as_parse(self):
+        for parser_class, sample, encoding in SAMPLES:
+            with self.subTest(parser=parser_class.__name__):
+                with open(sample_path(sample), encoding=encoding) as fin:
+                    expected = parser_class(fin).parse()
+                with open(sample_path(sample), encoding=encoding) as fin:
+                    rows = [row for batch in writers.iter_batches(
+                        parser_class(fin), 4) for row in batch]
+
+                self.assertEqual(
+                    [(x[3], x[4], x[7], x[9]) for x in rows],
+                    [(x.id, x.date, x.amount, x.memo)
+                     for x in expected.lines])
+                self.assertEqual({x[1] for x in rows},
+                                 {expected.account_id})
+
+
+class TestBatchFormats(unittest.TestCase):
+    """The batch conversion writes the tabular formats."""
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def test_jsonl(self):
+        jobs = [(sample_path('raiffeisen.csv'), 'raiffeisen')]
+        results = convert_files(jobs, output_dir=self.tmpdir, workers=1,
+                                output_format='jsonl')
+        self.assertIsNone(results[0].error)
+        self.assertEqual(results[0].rows, 7)
+        self.assertEqual(results[0].output,
+                         os.path.join(self.tmpdir, 'raiffeisen.jsonl'))
+        with open(results[0].output, encoding='utf-8') as fin:
+            self.assertEqual(len(fin.readlines()), 7)
+
+    def test_input_is_not_replaced(self):
+        filename = os.path.join(self.tmpdir, 'raiffeisen.csv')
+        shutil.copy(sample_path('raiffeisen.csv'), filename)
+        rc = main(['-t', 'raiffeisen', '-j', '1', '-f', 'csv', filename])
+        self.assertEqual(rc, 1)
+        with open(filename, 'rb') as fin, \
+                open(sample_path('raiffeisen.csv'), 'rb') as expected:
+            self.assertEqual(fin.read(), expected.read())
+
+# vim: tabstop=4 expandtab shiftwidth=4 softtabstop=4 smartindent autoindent
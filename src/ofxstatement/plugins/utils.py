@@ -2,14 +2,77 @@
 # This file is part of ofxstatement-austrian.
 # See README.rst for more information.
 
+import functools
+import re
+from datetime import datetime
+from decimal import Decimal
+
 
 def clean_multiple_whitespaces(uncleaned_string):
     """Clean a string from multiple consecutive white spaces."""
     return ' '.join(uncleaned_string.split())
 
 
+# An amount in the austrian format: an optional sign, digits with or without
+# a ».« every three digits and optional decimals after a »,«. The digits
+# without ».« only match one way, so a failing match does not backtrack
+# through all the ways to split them.
+AMOUNT = re.compile(
+    r'[+-]?(?:[0-9]{1,3}(?:\.[0-9]{3})+|[0-9]+)(?:,[0-9]+)?')
+
+
 def fix_amount_string(amount):
     """Replace »,« with ».« to make the amount parseable."""
     return amount.replace('.', '').replace(',', '.')
 
+
+def parse_austrian_amount(value, match=AMOUNT.fullmatch):
+    """Parse an amount in the austrian format, e.g. -1.234,56, to Decimal.
+
+    Anything else, including whitespace, exponents and misplaced ».«, is
+    rejected with a ValueError. The check is not free: for plain amounts
+    this takes about twice as long as converting with fix_amount_string and
+    Decimal, which accept such values silently (see benchmarks/amounts.py).
+    """
+    if match(value) is None:
+        raise ValueError("Invalid amount {!r}, expected e.g. "
+                         "-1.234,56".format(value))
+    return Decimal(value.replace('.', '').replace(',', '.'))
+
+
+class LazyRegex(object):
+    """A regular expression class attribute, compiled on first access."""
+
+    def __init__(self, pattern, flags=0):
+        self.pattern = pattern
+        self.flags = flags
+        self.regex = None
+
+    def __get__(self, instance, owner):
+        if self.regex is None:
+            self.regex = re.compile(self.pattern, self.flags)
+        return self.regex
+
+
+@functools.lru_cache(maxsize=4096)
+def parse_date(value, date_format):
+    """Parse a date string, caching the result.
+
+    The layouts "%d.%m.%Y" and "%Y-%m-%d" are parsed by hand, everything else
+    is passed on to strptime. Use parse_date.cache_info() to get the number
+    of cache hits and misses.
+    """
+    if len(value) == 10:
+        if date_format == "%d.%m.%Y" and value[2] == value[5] == '.':
+            day, month, year = value[:2], value[3:5], value[6:]
+        elif date_format == "%Y-%m-%d" and value[4] == value[7] == '-':
+            year, month, day = value[:4], value[5:7], value[8:]
+        else:
+            day = month = year = ''
+
+        if (day + month + year).isdigit():
+            return datetime(int(year), int(month), int(day))
+
+    return datetime.strptime(value, date_format)
+
 # vim: tabstop=4 expandtab shiftwidth=4 softtabstop=4 smartindent autoindent
@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+# This file is part of ofxstatement-austrian.
+# See README.rst for more information.
+
+"""Write parsed statement lines as CSV, JSON Lines or Parquet.
+
+The lines are taken from the parser in batches while it parses the file, so
+neither the whole statement nor an OFX document is held in memory. Each row
+holds the bank, account and currency of its statement besides the fields of
+the line; combined exports are split by account (see iter_statement_lines).
+Dates are written as ISO dates and amounts exactly, as decimal strings in
+CSV and JSON Lines and as decimals in Parquet.
+"""
+
+import collections
+import csv
+import itertools
+import json
+
+# The columns of all tabular formats
+COLUMNS = ('bank_id', 'account_id', 'currency', 'id', 'date', 'date_user',
+           'trntype', 'amount', 'payee', 'memo', 'check_no', 'refnum')
+
+# Number of lines written at once, also the size of the Parquet row groups
+BATCH_SIZE = 10000
+
+# Precision and scale of the Parquet amounts
+AMOUNT_PRECISION = 18
+AMOUNT_SCALE = 2
+
+# The pyarrow module once imported, None if it is not installed
+pyarrow = False
+
+# A writer function, the extension of its files and if it writes bytes
+Format = collections.namedtuple('Format', 'write extension binary')
+
+
+def get_pyarrow():
+    """Import pyarrow on first use."""
+    global pyarrow
+    if pyarrow is False:
+        try:
+            import pyarrow as module
+            import pyarrow.parquet  # noqa: F401
+        except ImportError:
+            module = None
+        pyarrow = module
+    return pyarrow
+
+
+def iter_batches(parser, batch_size=BATCH_SIZE):
+    """Parse the file of a parser and yield lists of rows of COLUMNS."""
+    rows = (
+        (stmt.bank_id, stmt.account_id, stmt.currency, line.id, line.date,
+         line.date_user, line.trntype, line.amount, line.payee, line.memo,
+         line.check_no, line.refnum)
+        for stmt, line in parser.iter_statement_lines())
+    while True:
+        batch = list(itertools.islice(rows, batch_size))
+        if not batch:
+            return
+        yield batch
+
+
+def format_batch(batch, empty=''):
+    """Format the dates and amounts of a batch of rows as text.
+
+    None is replaced by empty. The batch is converted column by column.
+    """
+    columns = []
+    for name, values in zip(COLUMNS, zip(*batch)):
+        if name in ('date', 'date_user'):
+            values = [empty if x is None else x.date().isoformat()
+                      for x in values]
+        elif name == 'amount':
+            values = [empty if x is None else str(x) for x in values]
+        elif empty is not None and None in values:
+            values = [empty if x is None else x for x in values]
+        columns.append(values)
+    return zip(*columns)
+
+
+def write_csv(batches, fout):
+    """Write rows as comma separated values with a header.
+
+    Returns the number of rows written.
+    """
+    writer = csv.writer(fout, lineterminator='\n')
+    writer.writerow(COLUMNS)
+    count = 0
+    for batch in batches:
+        writer.writerows(format_batch(batch))
+        count += len(batch)
+    return count
+
+
+def write_jsonl(batches, fout):
+    """Write rows as JSON objects, one per line.
+
+    Returns the number of rows written.
+    """
+    count = 0
+    for batch in batches:
+        fout.write(''.join(
+            json.dumps(dict(zip(COLUMNS, row)), ensure_ascii=False) + '\n'
+            for row in format_batch(batch, None)))
+        count += len(batch)
+    return count
+
+
+def parquet_schema():
+    """Get the Parquet schema of the rows."""
+    pa = get_pyarrow()
+    types = {
+        'date': pa.date32(),
+        'date_user': pa.date32(),
+        'amount': pa.decimal128(AMOUNT_PRECISION, AMOUNT_SCALE),
+    }
+    return pa.schema([(name, types.get(name, pa.string()))
+                      for name in COLUMNS])
+
+
+def check_amounts(amounts):
+    """Check that amounts fit the decimals of the Parquet schema.
+
+    Raises ValueError for more than AMOUNT_SCALE decimals or too many
+    digits, which pyarrow would only report while converting a batch.
+    """
+    digits = AMOUNT_PRECISION - AMOUNT_SCALE
+    for amount in amounts:
+        if amount is not None and (
+                amount.as_tuple().exponent < -AMOUNT_SCALE or
+                amount.adjusted() >= digits):
+            raise ValueError(
+                "Cannot write the amount {} to Parquet, which takes at most "
+                "{} digits before and {} after the decimal point".format(
+                    amount, digits, AMOUNT_SCALE))
+
+
+def write_parquet(batches, fout):
+    """Write rows as Parquet, one row group per batch.
+
+    Needs pyarrow. The amounts of each batch are checked with check_amounts
+    before it is written. Returns the number of rows written.
+    """
+    pa = get_pyarrow()
+    if pa is None:
+        raise ImportError("Parquet output needs pyarrow, which is not "
+                          "installed")
+
+    schema = parquet_schema()
+    count = 0
+    with pa.parquet.ParquetWriter(fout, schema) as writer:
+        for batch in batches:
+            columns = [list(x) for x in zip(*batch)]
+            check_amounts(columns[COLUMNS.index('amount')])
+            for name in ('date', 'date_user'):
+                i = COLUMNS.index(name)
+                columns[i] = [None if x is None else x.date()
+                              for x in columns[i]]
+            writer.write_table(pa.Table.from_arrays(
+                [pa.array(values, field.type)
+                 for values, field in zip(columns, schema)],
+                schema=schema))
+            count += len(batch)
+    return count
+
+
+FORMATS = {
+    'csv': Format(write_csv, '.csv', False),
+    'jsonl': Format(write_jsonl, '.jsonl', False),
+    'parquet': Format(write_parquet, '.parquet', True),
+}
+
+
+def write(parser, fout, output_format, batch_size=BATCH_SIZE):
+    """Parse the file of a parser and write its lines in a format.
+
+    fout must be opened in binary mode for Parquet and in text mode for the
+    other formats. Returns the number of rows written.
+    """
+    return FORMATS[output_format].write(iter_batches(parser, batch_size),
+                                        fout)
+
+# vim: tabstop=4 expandtab shiftwidth=4 softtabstop=4 smartindent autoindent